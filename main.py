@@ -2,11 +2,14 @@
 # main.py
 
 import sys
-from PyQt6.QtWidgets import QApplication
-from src.gui.main_window import MainWindow
 
 def main():
     """Run the PIEZO1 analysis application."""
+    # Imported here so stack-analysis worker processes, which re-import
+    # this module, don't load the GUI
+    from PyQt6.QtWidgets import QApplication
+    from src.gui.main_window import MainWindow
+
     # Create application
     app = QApplication(sys.argv)
     
@@ -7,9 +7,11 @@ Analysis modules for the PIEZO1 Analysis Tool.
 from .edge_detection import EdgeDetector
 from .curvature_analyzer import CurvatureAnalyzer
 from .fluorescence_analyzer import FluorescenceAnalyzer
+from .stack_analysis import analyze_frame
 
 __all__ = [
     'EdgeDetector',
     'CurvatureAnalyzer',
-    'FluorescenceAnalyzer'
+    'FluorescenceAnalyzer',
+    'analyze_frame'
 ]
\ No newline at end of file
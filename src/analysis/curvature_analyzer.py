@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 # src/analysis/curvature_analyzer.py
 
+import logging
 import numpy as np
 from typing import Optional, List, Dict, Tuple
 from ..utils.data_structures import EdgeData, CurvatureData, AnalysisParameters
 
+logger = logging.getLogger(__name__)
+
 class CurvatureAnalyzer:
     """Class for analyzing membrane curvature."""
 
@@ -29,6 +32,7 @@ class CurvatureAnalyzer:
                 half_segment = self.params.segment_length // 2
                 curvatures = []
                 segment_indices = []
+                segments = []
                 self.valid_indices = []
 
                 # Use provided indices or generate new ones
@@ -37,23 +41,21 @@ class CurvatureAnalyzer:
                 else:
                     sample_indices = np.linspace(0, n_points-1, self.params.n_samples, dtype=int)
 
-                for idx in sample_indices:
-                    try:
-                        indices = np.arange(idx - half_segment, idx + half_segment + 1) % n_points
-                        segment = points[indices]
-
-                        if len(segment) < 3:
-                            continue
+                # Contour indices of every segment at once, one row per sample
+                offsets = np.arange(-half_segment, half_segment + 1)
+                if len(offsets) < 3:
+                    return None
+                index_matrix = (np.asarray(sample_indices)[:, None] + offsets) % n_points
+                all_segments = points[index_matrix]
 
-                        curvature = self._fit_circle_to_segment(segment)
-                        if curvature != 0:  # Only keep valid measurements
-                            curvatures.append(curvature)
-                            segment_indices.append(indices.tolist())
-                            self.valid_indices.append(idx)
+                all_curvatures = self._fit_circles(all_segments)
 
-                    except Exception as e:
-                        print(f"Error calculating curvature at index {idx}: {e}")
-                        continue
+                for idx, indices, curvature in zip(sample_indices, index_matrix, all_curvatures):
+                    if curvature != 0:  # Only keep valid measurements
+                        curvatures.append(curvature)
+                        segment_indices.append(indices.tolist())
+                        segments.append(edge_data.contour[indices])
+                        self.valid_indices.append(idx)
 
                 if not curvatures:
                     return None
@@ -66,11 +68,12 @@ class CurvatureAnalyzer:
                     curvatures=np.array(curvatures),
                     segment_indices=segment_indices,
                     ref_curvatures=self.ref_curvatures,
-                    radius_scale=self.params.radius_scale
+                    radius_scale=self.params.radius_scale,
+                    segments=segments
                 )
 
             except Exception as e:
-                print(f"Error in curvature calculation: {e}")
+                logger.error("Error in curvature calculation: %s", e)
                 return None
 
     def get_valid_indices(self) -> Optional[np.ndarray]:
@@ -81,84 +84,102 @@ class CurvatureAnalyzer:
         """Fit circle to segment and return signed curvature."""
         if len(segment) < 3:
             return 0
+        return self._fit_circles(segment[np.newaxis])[0]
 
-        # Translate segment to origin
-        center = segment.mean(axis=0)
-        centered = segment - center
+    def _fit_circles(self, segments: np.ndarray) -> np.ndarray:
+        """Fit circles to a stack of segments and return signed curvatures.
 
-        # Scale coordinates to nanometers
-        centered = centered * self.params.pixel_size
+        Batched form of _fit_circle_to_segment for an (n, m, 2) array of
+        equal-length segments; failed fits give a curvature of 0.
+        """
+        segments = np.asarray(segments)
+        n_segments, n_points = segments.shape[:2]
+        if n_segments == 0 or n_points < 3:
+            return np.zeros(n_segments)
 
-        # Apply algebraic circle fitting
-        x = centered[:, 0]
-        y = centered[:, 1]
-        z = x*x + y*y
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            # Translate segments to origin
+            center = segments.mean(axis=1)
+            centered = segments - center[:, np.newaxis]
 
-        # Check for valid values
-        if np.any(np.isnan(z)) or np.any(np.isinf(z)):
-            return 0
+            # Scale coordinates to nanometers, in place
+            centered *= self.params.pixel_size
+
+            # Apply algebraic circle fitting
+            x = centered[..., 0]
+            y = centered[..., 1]
+            z = x*x + y*y
+
+            # Check for valid values
+            valid = np.all(np.isfinite(z), axis=1)
 
-        ZXY = np.column_stack((z, x, y))
-        A = np.dot(ZXY.T, ZXY)
-        B = np.array([[4, 0, 0], [0, 1, 0], [0, 0, 1]])
+            ZXY = np.stack((z, x, y), axis=2)
+            A = np.matmul(ZXY.transpose(0, 2, 1), ZXY)
 
-        try:
-            # Compute eigenvalues and eigenvectors
-            eigenvalues, eigenvectors = np.linalg.eig(np.dot(np.linalg.inv(B), A))
+            # inv(B) @ A for the constraint matrix B = diag(4, 1, 1), applied
+            # as a row scaling instead of inverting B on every fit
+            M = A * np.array([[0.25], [1.0], [1.0]])
+            M[~valid] = np.eye(3)  # Keep eig away from invalid input
+
+            # Compute eigenvalues and eigenvectors of every system at once
+            try:
+                eigenvalues, eigenvectors = np.linalg.eig(M)
+            except np.linalg.LinAlgError:
+                if n_segments == 1:
+                    return np.zeros(1)
+                # Retry one by one so a single bad system only loses itself
+                return np.array([self._fit_circle_to_segment(s) for s in segments])
+
+            # Treat complex solutions as failed fits (M is similar to a
+            # symmetric matrix, so these only arise from round-off)
+            if np.iscomplexobj(eigenvalues):
+                valid &= np.all(eigenvalues.imag == 0, axis=1)
+                valid &= np.all(eigenvectors.imag == 0, axis=(1, 2))
+                eigenvalues = eigenvalues.real
+                eigenvectors = eigenvectors.real
 
             # Check for valid eigenvalues
-            if np.any(np.isnan(eigenvalues)) or np.any(np.isinf(eigenvalues)):
-                return 0
+            valid &= np.all(np.isfinite(eigenvalues), axis=1)
 
             # Get eigenvector corresponding to smallest eigenvalue
-            v = eigenvectors[:, np.argmin(np.abs(eigenvalues))]
+            smallest = np.argmin(np.abs(eigenvalues), axis=1)
+            v = eigenvectors[np.arange(n_segments), :, smallest]
 
             # Check for valid eigenvector
-            if np.any(np.isnan(v)) or np.any(np.isinf(v)) or np.abs(v[0]) < 1e-10:
-                return 0
+            valid &= np.all(np.isfinite(v), axis=1) & (np.abs(v[:, 0]) >= 1e-10)
 
             # Calculate center and radius of fitted circle
-            a = -v[1]/(2*v[0])
-            b = -v[2]/(2*v[0])
+            a = -v[:, 1]/(2*v[:, 0])
+            b = -v[:, 2]/(2*v[:, 0])
 
             # Check term under square root
-            radicand = a*a + b*b - v[0]/v[2]
-            if radicand <= 0:
-                return 0
+            radicand = a*a + b*b - v[:, 0]/v[:, 2]
+            valid &= radicand > 0
 
             r = np.sqrt(radicand)  # Radius is now in nanometers
 
             # Verify the fit is reasonable
             min_radius = self.params.segment_length * self.params.pixel_size / 2
-            if (not np.isfinite(r) or r < min_radius):
-                return 0
+            valid &= np.isfinite(r) & (r >= min_radius)
 
             # Calculate outward-pointing normal
-            segment_dir = segment[-1] - segment[0]
-            normal = np.array([-segment_dir[1], segment_dir[0]])
-            normal_norm = np.linalg.norm(normal)
-
-            if normal_norm < 1e-10:
-                return 0
-
-            normal = normal / normal_norm
+            segment_dir = segments[:, -1] - segments[:, 0]
+            normal = np.stack([-segment_dir[:, 1], segment_dir[:, 0]], axis=1)
+            normal_norm = np.hypot(segment_dir[:, 0], segment_dir[:, 1])
+            valid &= normal_norm >= 1e-10
+            normal = normal / normal_norm[:, np.newaxis]
 
             # Determine if normal points outward
-            center_point = np.array([a, b]) / self.params.pixel_size + center
-            to_center = center_point - segment.mean(axis=0)
-            to_center_norm = np.linalg.norm(to_center)
-
-            if to_center_norm > 0:
-                # Curvature is positive when bulging inward (cytosol)
-                sign = -np.sign(np.dot(to_center/to_center_norm, normal))
-                curvature = (1/r) * sign  # Curvature is now in nm^-1
-            else:
-                curvature = 0
+            center_point = np.stack([a, b], axis=1) / self.params.pixel_size + center
+            to_center = center_point - center
+            to_center_norm = np.hypot(to_center[:, 0], to_center[:, 1])
 
-            return curvature
+            # Curvature is positive when bulging inward (cytosol)
+            sign = -np.sign(np.sum(to_center/to_center_norm[:, np.newaxis] * normal, axis=1))
+            curvatures = (1/r) * sign  # Curvature is now in nm^-1
+            valid &= to_center_norm > 0
 
-        except (np.linalg.LinAlgError, ValueError, ZeroDivisionError):
-            return 0
+        return np.where(valid, curvatures, 0.0)
 
     def get_curvature_statistics(self, curvature_data: CurvatureData) -> Dict[str, float]:
         """Calculate statistical measures of curvature."""
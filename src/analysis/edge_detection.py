@@ -1,15 +1,20 @@
 #!/usr/bin/env python3
 # src/analysis/edge_detection.py
 
+import logging
 import numpy as np
 import cv2
-from skimage import morphology
 from scipy.ndimage import gaussian_filter1d
 from typing import Tuple, Optional
 from ..utils.data_structures import EdgeData, ImageData, AnalysisParameters
 
+logger = logging.getLogger(__name__)
+
 class EdgeDetector:
     """Class for detecting and processing cell edges from binary masks."""
+
+    # Scratch buffer reused by detect_edge, reallocated on shape change
+    _binary_buffer = np.empty((0, 0), dtype=np.uint8)
     
     def __init__(self, params: AnalysisParameters):
         self.params = params
@@ -17,12 +22,20 @@ class EdgeDetector:
     def detect_edge(self, image_data: ImageData) -> Optional[EdgeData]:
         """Detect cell edge from binary segmentation."""
         try:
-            # Clean up binary image
-            cleaned = morphology.remove_small_objects(
-                image_data.data > 0,
-                min_size=self.params.min_size
+            # Binarize into the scratch buffer and clean it up in place
+            if EdgeDetector._binary_buffer.shape != image_data.data.shape:
+                EdgeDetector._binary_buffer = np.empty(image_data.data.shape, dtype=np.uint8)
+            cleaned = EdgeDetector._binary_buffer
+            np.greater(image_data.data, 0, out=cleaned.view(bool))
+
+            # Remove objects smaller than min_size (4-connected, as in
+            # skimage's remove_small_objects)
+            _, labels, stats, _ = cv2.connectedComponentsWithStats(
+                cleaned, connectivity=4
             )
-            cleaned = cleaned.astype(np.uint8)
+            keep = (stats[:, cv2.CC_STAT_AREA] >= self.params.min_size).astype(np.uint8)
+            keep[0] = 0
+            np.take(keep, labels, out=cleaned)
             
             # Find contours using OpenCV
             contours, _ = cv2.findContours(
@@ -37,15 +50,8 @@ class EdgeDetector:
             # Get largest contour by area
             largest_contour = max(contours, key=cv2.contourArea)
             
-            # Create edge image
-            edge_image = np.zeros_like(cleaned)
-            cv2.drawContours(edge_image, [largest_contour], -1, 255, 2)
-            
-            # Create EdgeData object
-            edge_data = EdgeData(
-                contour=largest_contour.squeeze(),
-                edge_image=edge_image
-            )
+            # Create EdgeData object; the edge is drawn from the contour
+            edge_data = EdgeData(contour=largest_contour.squeeze())
             
             # Apply initial smoothing if needed
             if self.params.smoothing_sigma > 0:
@@ -54,31 +60,22 @@ class EdgeDetector:
             return edge_data
             
         except Exception as e:
-            print(f"Error in edge detection: {e}")
+            logger.error("Error in edge detection: %s", e)
             return None
     
     def get_normal_vectors(self, edge_data: EdgeData, smooth: bool = True) -> np.ndarray:
         """Calculate normal vectors along the contour."""
         contour = edge_data.smoothed_contour if smooth else edge_data.contour
-        n_points = len(contour)
-        normals = np.zeros((n_points, 2))
         
-        for i in range(n_points):
-            # Get next point (with wraparound)
-            next_idx = (i + 1) % n_points
-            
-            # Calculate tangent vector
-            tangent = contour[next_idx] - contour[i]
-            
-            # Calculate normal vector (perpendicular to tangent)
-            normal = np.array([-tangent[1], tangent[0]])
-            
-            # Normalize
-            norm = np.linalg.norm(normal)
-            if norm > 0:
-                normal = normal / norm
-                
-            normals[i] = normal
+        # Tangent to the next point (with wraparound)
+        tangents = np.roll(contour, -1, axis=0) - contour
+        
+        # Normal vectors (perpendicular to tangents)
+        normals = np.stack([-tangents[:, 1], tangents[:, 0]], axis=1).astype(float)
+        
+        # Normalize, leaving zero-length normals at zero
+        norms = np.hypot(tangents[:, 0], tangents[:, 1])[:, np.newaxis]
+        np.divide(normals, norms, out=normals, where=norms > 0)
             
         return normals
     
@@ -91,17 +88,18 @@ class EdgeDetector:
         """Verify and correct normal vector directions to point inward."""
         verified_normals = normals.copy()
         
-        for i, (point, normal) in enumerate(zip(edge_data.contour, normals)):
-            # Test point slightly along normal direction
-            test_point = point + normal * 5
-            test_x, test_y = test_point.astype(int)
-            
-            # Check if coordinates are within image bounds
-            if (0 <= test_x < binary_image.shape[1] and 
-                0 <= test_y < binary_image.shape[0]):
-                # If test point is outside cell (0), flip normal
-                if binary_image[test_y, test_x] == 0:
-                    verified_normals[i] = -normal
+        # Test points slightly along each normal direction
+        test_points = (edge_data.contour + normals * 5).astype(int)
+        test_x, test_y = test_points[:, 0], test_points[:, 1]
+        
+        # Only test points within image bounds
+        in_bounds = ((test_x >= 0) & (test_x < binary_image.shape[1]) &
+                     (test_y >= 0) & (test_y < binary_image.shape[0]))
+        
+        # If test point is outside cell (0), flip normal
+        outside = np.zeros(len(normals), dtype=bool)
+        outside[in_bounds] = binary_image[test_y[in_bounds], test_x[in_bounds]] == 0
+        verified_normals[outside] = -normals[outside]
                     
         return verified_normals
     
@@ -1,12 +1,16 @@
 #!/usr/bin/env python3
 # src/analysis/fluorescence_analyzer.py
 
+import logging
+import math
 import numpy as np
-import cv2
 from typing import Optional, List, Dict, Tuple
 from ..utils.data_structures import (
     EdgeData, FluorescenceData, ImageData, AnalysisParameters
     )
+from ..utils.image_processing import ImageProcessor
+
+logger = logging.getLogger(__name__)
 
 class FluorescenceAnalyzer:
     """Class for analyzing membrane-proximal fluorescence."""
@@ -35,6 +39,9 @@ class FluorescenceAnalyzer:
             # Define border margin
             border_margin = 20
 
+            # Contour orientation, shared by all sampling normals
+            inward_sign = ImageProcessor.inward_normal_sign(edge_data.contour)
+
             # Create arrays to store valid measurements
             valid_points = []
             valid_intensities = []
@@ -55,7 +62,8 @@ class FluorescenceAnalyzer:
                         segment=segment,
                         fluor_image=fluor_data.data,
                         cell_mask=cell_mask.data,
-                        border_margin=border_margin
+                        border_margin=border_margin,
+                        inward_sign=inward_sign
                     )
 
                     if intensity_data is not None:
@@ -66,7 +74,7 @@ class FluorescenceAnalyzer:
                         self.valid_indices.append(idx)
 
                 except Exception as e:
-                    print(f"Error calculating intensity at index {idx}: {e}")
+                    logger.debug("Error calculating intensity at index %s: %s", idx, e)
                     continue
 
             if not valid_points:
@@ -84,7 +92,7 @@ class FluorescenceAnalyzer:
             )
 
         except Exception as e:
-            print(f"Error in intensity calculation: {str(e)}")
+            logger.error("Error in intensity calculation: %s", e)
             raise
 
     def get_valid_indices(self) -> Optional[np.ndarray]:
@@ -96,9 +104,14 @@ class FluorescenceAnalyzer:
         segment: np.ndarray,
         fluor_image: np.ndarray,
         cell_mask: np.ndarray,
-        border_margin: int
+        border_margin: int,
+        inward_sign: float
     ) -> Optional[dict]:
-        """Calculate intensity for a single sampling point."""
+        """Calculate intensity for a single sampling point.
+
+        inward_sign orients the segment's left-hand normal into the cell
+        (see ImageProcessor.inward_normal_sign).
+        """
         # Get current point (central point of segment)
         current = segment[len(segment)//2]
 
@@ -112,57 +125,38 @@ class FluorescenceAnalyzer:
         # Calculate normal vector
         tangent = segment[-1] - segment[0]
         normal = np.array([-tangent[1], tangent[0]])
-        norm = np.linalg.norm(normal)
+        norm = math.hypot(tangent[0], tangent[1])
         if norm < 1e-10:
             return None
-        normal = normal / norm
-
-        # Check if normal points into the cell
-        test_point = current + normal * 5
-        test_x, test_y = test_point.astype(int)
-        if (0 <= test_x < cell_mask.shape[1] and
-            0 <= test_y < cell_mask.shape[0]):
-            if cell_mask[test_y, test_x] == 0:  # If test point is outside
-                normal = -normal  # Flip the normal to point inward
+        # Normalize and orient into the cell
+        normal = normal * (inward_sign / norm)
 
         # Create sampling rectangle coordinates
-        perpendicular = np.array([-normal[1], normal[0]])
-        center = current + (normal * self.params.vector_depth / 2)
-        half_width = self.params.vector_width / 2
-        half_depth = self.params.vector_depth / 2
-
-        rect_points = np.array([
-            center - perpendicular * half_width - normal * half_depth,
-            center + perpendicular * half_width - normal * half_depth,
-            center + perpendicular * half_width + normal * half_depth,
-            center - perpendicular * half_width + normal * half_depth
-        ])
+        rect_points = ImageProcessor.sampling_rectangle(
+            current, normal, self.params.vector_width, self.params.vector_depth
+        )
 
         # Get integer coordinates for sampling
         rect_coords = rect_points.astype(int)
 
         # Check if rectangle is fully within image bounds
-        if (np.any(rect_coords[:, 0] < 0) or
-            np.any(rect_coords[:, 0] >= fluor_image.shape[1]) or
-            np.any(rect_coords[:, 1] < 0) or
-            np.any(rect_coords[:, 1] >= fluor_image.shape[0])):
+        if (rect_coords.min() < 0 or
+            np.any(rect_coords >= (fluor_image.shape[1], fluor_image.shape[0]))):
             return None
 
-        # Create mask for the rectangle
-        rect_mask = np.zeros_like(fluor_image, dtype=np.uint8)
-        cv2.fillPoly(rect_mask, [rect_coords], 1)
+        # Create mask for the rectangle within its bounding box
+        mask, region = ImageProcessor.polygon_mask(rect_coords, fluor_image.shape)
 
         # Calculate percentage of rectangle that overlaps with cell interior
-        interior_overlap = (np.sum(rect_mask & (cell_mask > 0)) /
-                          np.sum(rect_mask) * 100)
+        interior_overlap = (np.count_nonzero(mask & (cell_mask[region] > 0)) /
+                          np.count_nonzero(mask) * 100)
 
         # Skip if doesn't meet interior threshold
         if interior_overlap < self.params.interior_threshold:
             return None
 
         # Sample fluorescence values using the mask
-        mask = rect_mask.astype(bool)
-        fluorescence_values = fluor_image[mask]
+        fluorescence_values = fluor_image[region][mask]
 
         if len(fluorescence_values) == 0:
             return None
@@ -214,8 +208,7 @@ class FluorescenceAnalyzer:
                 f'Found {n_low_overlap} sampling regions with <{low_overlap_threshold}% interior overlap')
 
         # Check for potentially saturated pixels
-        max_intensities = [data['max'] for data in fluor_data.sampling_points]
-        if any(intensity >= 255 for intensity in max_intensities):
+        if np.any(fluor_data.max_intensities >= 255):
             debug_info['warnings'].append('Some sampling regions contain saturated pixels')
 
         # Calculate coefficient of variation
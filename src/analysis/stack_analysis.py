@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# src/analysis/stack_analysis.py
+
+import numpy as np
+from typing import Optional, Tuple
+from ..utils.data_structures import ImageData, AnalysisParameters
+from ..utils.image_processing import ImageProcessor
+
+def _segment_curvatures(contour, indices, params, curvature_analyzer) -> np.ndarray:
+    """Fit the curvature segments centered on the given indices in one batch."""
+    half_segment = params.segment_length // 2
+    offsets = np.arange(-half_segment, half_segment + 1)
+    segment_indices = (np.asarray(indices)[:, np.newaxis] + offsets) % len(contour)
+    return curvature_analyzer._fit_circles(contour[segment_indices])
+
+def analyze_frame(
+    cell_data: ImageData,
+    fluor_data: Optional[ImageData],
+    params: AnalysisParameters,
+    edge_detector,
+    curvature_analyzer,
+    fluorescence_analyzer
+) -> Optional[Tuple[np.ndarray, Optional[np.ndarray], Optional[float]]]:
+    """Analyze one stack frame independently of the GUI.
+
+    Returns the valid curvatures, the matching intensities and their
+    correlation (None without fluorescence data), or None if the frame
+    gives no valid measurements.
+    """
+    # Run edge detection
+    edge_data = edge_detector.detect_edge(cell_data)
+    if edge_data is None:
+        return None
+
+    # Generate sampling points
+    contour = edge_data.smoothed_contour if edge_data.smoothed_contour is not None else edge_data.contour
+    n_points = len(contour)
+    sample_indices = np.linspace(0, n_points-1, params.n_samples, dtype=int)
+
+    if fluor_data is None:
+        # Calculate just curvature for all points
+        frame_curvatures = _segment_curvatures(contour, sample_indices, params, curvature_analyzer)
+        frame_curvatures = frame_curvatures[frame_curvatures != 0]
+        if not len(frame_curvatures):
+            return None
+        return frame_curvatures, None, None
+
+    # Calculate intensities first (to get valid sampling points)
+    inward_sign = ImageProcessor.inward_normal_sign(contour)
+    frame_intensities = []
+    valid_indices = []
+    for idx in sample_indices:
+        # Get segment for normal calculation
+        half_segment = params.edge_segment // 2
+        segment_indices = np.arange(idx - half_segment, idx + half_segment + 1) % n_points
+        segment = contour[segment_indices]
+
+        intensity_data = fluorescence_analyzer._calculate_single_intensity(
+            segment,  # Pass full segment for normal calculation
+            fluor_data.data,
+            cell_data.data,
+            border_margin=20,
+            inward_sign=inward_sign
+        )
+
+        if intensity_data is not None:
+            frame_intensities.append(intensity_data['mean'])
+            valid_indices.append(idx)
+
+    if not valid_indices:
+        return None
+
+    # Now calculate curvature only for valid intensity points
+    frame_curvatures = _segment_curvatures(contour, valid_indices, params, curvature_analyzer)
+    frame_intensities = np.array(frame_intensities)
+
+    # Only keep points where curvature is valid
+    valid_curv = frame_curvatures != 0
+    if not np.any(valid_curv):
+        return None
+    correlation = np.corrcoef(frame_curvatures[valid_curv],
+                              frame_intensities[valid_curv])[0, 1]
+    return frame_curvatures[valid_curv], frame_intensities[valid_curv], correlation
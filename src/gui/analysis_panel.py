@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QGroupBox,
     QLabel, QSlider, QPushButton, QDoubleSpinBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from ..utils.data_structures import AnalysisParameters
 
 class AnalysisPanel(QWidget):
@@ -13,10 +13,22 @@ class AnalysisPanel(QWidget):
 
     # Signal emitted when parameters change
     parameters_changed = pyqtSignal()
+    # Signal emitted when only visualization parameters change
+    display_changed = pyqtSignal()
+
+    # Delay used to coalesce bursts of slider changes
+    DEBOUNCE_MS = 50
 
     def __init__(self, params: AnalysisParameters):
         super().__init__()
         self.params = params
+
+        # Single-shot timer so rapid slider moves trigger one update
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.parameters_changed.emit)
+
         self._init_ui()
 
     def _init_ui(self):
@@ -77,7 +89,7 @@ class AnalysisPanel(QWidget):
     def _on_pixel_size_changed(self, value):
         """Update pixel size parameter."""
         self.params.pixel_size = float(value)  # Ensure float conversion
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _create_curvature_group(self) -> QGroupBox:
         """Create group for curvature analysis parameters."""
@@ -177,55 +189,59 @@ class AnalysisPanel(QWidget):
 
         return group
 
+    def _schedule_update(self):
+        """Restart the debounce timer; parameters_changed fires once it expires."""
+        self._debounce.start()
+
     # Parameter update handlers
     def _on_samples_changed(self, value):
         self.params.n_samples = value
         self.samples_label.setText(f"Number of Samples: {value}")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_smoothing_changed(self, value):
         self.params.smoothing_sigma = value / 10
         self.smoothing_label.setText(f"Edge Smoothing σ: {self.params.smoothing_sigma:.1f}")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_segment_changed(self, value):
         self.params.segment_length = value
         self.segment_label.setText(f"Segment Length: {value}")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_width_changed(self, value):
         self.params.vector_width = value
         self.width_label.setText(f"Vector Width: {value} px")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_depth_changed(self, value):
         self.params.vector_depth = value
         self.depth_label.setText(f"Vector Depth: {value} px")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_interior_changed(self, value):
         self.params.interior_threshold = value
         self.interior_label.setText(f"Interior Threshold: {value}%")
-        self.parameters_changed.emit()
+        self._schedule_update()
 
     def _on_line_width_changed(self, value):
         self.params.line_width = value
         self.line_width_label.setText(f"Line Width: {value}")
-        self.parameters_changed.emit()
+        self.display_changed.emit()
 
     def _on_bg_opacity_changed(self, value):
         self.params.background_alpha = value / 100
         self.bg_opacity_label.setText(f"Background Opacity: {self.params.background_alpha:.1f}")
-        self.parameters_changed.emit()
+        self.display_changed.emit()
 
     def _on_rect_opacity_changed(self, value):
         self.params.rectangle_alpha = value / 100
         self.rect_opacity_label.setText(f"Rectangle Opacity: {self.params.rectangle_alpha:.1f}")
-        self.parameters_changed.emit()
+        self.display_changed.emit()
 
     def _on_show_edge_toggled(self, checked):
         self.params.show_edge = checked
-        self.parameters_changed.emit()
+        self.display_changed.emit()
 
     def get_parameters(self) -> AnalysisParameters:
         """Get current parameter values."""
@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 
+import logging
+import math
 import numpy as np
-import cv2
 from typing import Tuple, Optional, Dict, List
 from ..utils.data_structures import (
     EdgeData, CurvatureData, FluorescenceData, AnalysisParameters, ImageData
 )
+from ..utils.image_processing import ImageProcessor
+
+logger = logging.getLogger(__name__)
 
 class CoordinatedAnalysis:
     """Class to coordinate sampling between curvature and fluorescence analysis."""
@@ -15,6 +19,19 @@ class CoordinatedAnalysis:
         self.params = params
         self.contour = edge_data.smoothed_contour if edge_data.smoothed_contour is not None else edge_data.contour
         self.n_points = len(self.contour)
+
+        # Contiguous coordinate columns for vectorized per-point checks
+        self.xs = np.ascontiguousarray(self.contour[:, 0], dtype=float)
+        self.ys = np.ascontiguousarray(self.contour[:, 1], dtype=float)
+
+        # Contour orientation, shared by all sampling normals
+        self.inward_sign = ImageProcessor.inward_normal_sign(self.contour)
+
+        # Chord across each point's edge segment, with wraparound
+        half_segment = params.edge_segment // 2
+        contour = self.contour.astype(float)
+        self.tangents = (np.roll(contour, -half_segment, axis=0) -
+                         np.roll(contour, half_segment, axis=0))
         
     def generate_sampling_points(self) -> np.ndarray:
         """Generate initial sampling points."""
@@ -27,6 +44,19 @@ class CoordinatedAnalysis:
         return np.arange(point_idx - half_segment,
                         point_idx + half_segment + 1) % self.n_points
         
+    def filter_border_points(
+        self,
+        indices: np.ndarray,
+        shape: Tuple[int, int],
+        border_margin: int = 20
+    ) -> np.ndarray:
+        """Keep only the indices at least border_margin from the image edge."""
+        xs = self.xs[indices]
+        ys = self.ys[indices]
+        inside = ((xs >= border_margin) & (xs <= shape[1] - border_margin) &
+                  (ys >= border_margin) & (ys <= shape[0] - border_margin))
+        return indices[inside]
+
     def check_point_validity(
         self,
         idx: int,
@@ -40,72 +70,54 @@ class CoordinatedAnalysis:
             current = self.contour[idx]
             
             # Check border proximity
-            if (current[0] < border_margin or
-                current[0] > fluor_image.shape[1] - border_margin or
-                current[1] < border_margin or
-                current[1] > fluor_image.shape[0] - border_margin):
+            x, y = self.xs[idx], self.ys[idx]
+            if not (border_margin <= x <= fluor_image.shape[1] - border_margin and
+                    border_margin <= y <= fluor_image.shape[0] - border_margin):
                 return False, None
             
-            # Get segment for normal calculation
+            # Get segment for curvature fitting
             segment_indices = self.get_segment_indices(idx, self.params.edge_segment)
-            segment = self.contour[segment_indices].astype(float)
             
             # Calculate normal vector
-            tangent = segment[-1] - segment[0]
+            tangent = self.tangents[idx]
             normal = np.array([-tangent[1], tangent[0]])
-            norm = np.linalg.norm(normal)
+            norm = math.hypot(tangent[0], tangent[1])
             if norm < 1e-10:
                 return False, None
-            normal = normal / norm
-            
-            # Check if normal points into the cell
-            test_point = current + normal * 5
-            test_x, test_y = test_point.astype(int)
-            if (0 <= test_x < cell_mask.shape[1] and 
-                0 <= test_y < cell_mask.shape[0]):
-                if cell_mask[test_y, test_x] == 0:  # If test point is outside
-                    normal = -normal  # Flip normal to point inward
+            # Normalize and orient into the cell
+            normal = normal * (self.inward_sign / norm)
             
             # Create sampling rectangle
-            perpendicular = np.array([-normal[1], normal[0]])
-            center = current + (normal * self.params.vector_depth / 2)
-            half_width = self.params.vector_width / 2
-            half_depth = self.params.vector_depth / 2
-            
-            rect_points = np.array([
-                center - perpendicular * half_width - normal * half_depth,
-                center + perpendicular * half_width - normal * half_depth,
-                center + perpendicular * half_width + normal * half_depth,
-                center - perpendicular * half_width + normal * half_depth
-            ])
+            rect_points = ImageProcessor.sampling_rectangle(
+                current, normal, self.params.vector_width, self.params.vector_depth
+            )
             
             rect_coords = rect_points.astype(int)
             
             # Check rectangle bounds
-            if (np.any(rect_coords[:, 0] < 0) or
-                np.any(rect_coords[:, 0] >= fluor_image.shape[1]) or
-                np.any(rect_coords[:, 1] < 0) or
-                np.any(rect_coords[:, 1] >= fluor_image.shape[0])):
+            if (rect_coords.min() < 0 or
+                np.any(rect_coords >= (fluor_image.shape[1], fluor_image.shape[0]))):
                 return False, None
             
             # Create mask and check interior overlap
-            rect_mask = np.zeros_like(fluor_image, dtype=np.uint8)
-            cv2.fillPoly(rect_mask, [rect_coords], 1)
-            interior_overlap = (np.sum(rect_mask & (cell_mask > 0)) / 
-                              np.sum(rect_mask) * 100)
+            mask, region = ImageProcessor.polygon_mask(rect_coords, fluor_image.shape)
+            interior_overlap = (np.count_nonzero(mask & (cell_mask[region] > 0)) /
+                              np.count_nonzero(mask) * 100)
             
             if interior_overlap < self.params.interior_threshold:
                 return False, None
             
-            # Return sampling data for valid point
+            # Return sampling data for valid point, including the
+            # fluorescence values under the already rasterized rectangle
             return True, {
                 'center': current,
                 'normal': normal,
                 'rect_coords': rect_coords,
                 'segment_indices': segment_indices,
-                'interior_overlap': interior_overlap
+                'interior_overlap': interior_overlap,
+                'fluor_values': fluor_image[region][mask]
             }
             
         except Exception as e:
-            print(f"Error checking point validity: {e}")
+            logger.debug("Error checking point validity: %s", e)
             return False, None
\ No newline at end of file
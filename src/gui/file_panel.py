@@ -2,6 +2,9 @@
 # src/gui/file_panel.py
 
 import os
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from typing import Optional, Tuple, List
 import numpy as np
 import tifffile
@@ -10,11 +13,38 @@ from PyQt6.QtWidgets import (
     QPushButton, QLabel, QFileDialog, QSpinBox,
     QMessageBox, QProgressBar, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 
 from ..utils.data_structures import ImageData
+from ..analysis.stack_analysis import analyze_frame
 from ..gui.results_window import ResultsWindow
 
+logger = logging.getLogger(__name__)
+
+class _TiffPageStack:
+    """Read-only frame stack that decodes one TIFF page per access."""
+
+    def __init__(self, tif: tifffile.TiffFile):
+        self._tif = tif
+        self._pages = tif.series[0].pages
+        page = self._pages[0]
+        self.shape = (len(self._pages),) + page.shape
+        self.dtype = page.dtype
+        self.ndim = len(self.shape)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __getitem__(self, frame: int) -> np.ndarray:
+        return self._pages[frame].asarray()
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        stack = self._tif.series[0].asarray()
+        return stack if dtype is None else stack.astype(dtype)
+
+    def __del__(self):
+        self._tif.close()
+
 class FilePanel(QWidget):
     """Panel for handling file operations."""
 
@@ -23,6 +53,10 @@ class FilePanel(QWidget):
     fluorescence_loaded = pyqtSignal(object)  # Emits ImageData
     files_ready = pyqtSignal()  # Signal when both files are loaded and ready for analysis
 
+    # Stacks shorter than this are analyzed without worker processes;
+    # starting the workers costs about as much as analyzing 30 frames
+    _PARALLEL_MIN_FRAMES = 32
+
 
     def __init__(self, edge_detector, curvature_analyzer, fluorescence_analyzer, params, parent=None):
         super().__init__(parent)
@@ -38,6 +72,12 @@ class FilePanel(QWidget):
         self.fluor_stack = None
         self.current_frame = 0
 
+        # Coalesce rapid frame spinner changes into a single frame switch
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.setInterval(50)
+        self._frame_timer.timeout.connect(self._apply_frame_change)
+
         self._init_ui()
 
 
@@ -94,7 +134,7 @@ class FilePanel(QWidget):
         self.frame_spinner = QSpinBox()
         self.frame_spinner.setMinimum(0)
         self.frame_spinner.setMaximum(0)
-        self.frame_spinner.valueChanged.connect(self.change_frame)
+        self.frame_spinner.valueChanged.connect(self._on_frame_spinner_changed)
         frame_layout.addWidget(QLabel("Frame:"))
         frame_layout.addWidget(self.frame_spinner)
 
@@ -144,17 +184,17 @@ class FilePanel(QWidget):
             self.progress_bar.setValue(0)
 
             # Load image
-            image_stack = tifffile.imread(file_path)
+            image_stack = self._read_stack(file_path)
             self.progress_bar.setValue(50)
 
             # Process stack
             if image_stack.ndim > 2:
                 self.cell_stack = image_stack
                 self.frame_spinner.setMaximum(len(image_stack) - 1)
-                current_image = image_stack[self.current_frame]
+                current_image = self._load_frame(image_stack, self.current_frame)
             else:
                 self.cell_stack = image_stack[np.newaxis, ...]
-                current_image = image_stack
+                current_image = self._load_frame(image_stack)
 
             # Create ImageData object
             image_data = ImageData(
@@ -184,6 +224,53 @@ class FilePanel(QWidget):
             self.progress_bar.setVisible(False)
             QMessageBox.critical(self, "Error", f"Error loading cell mask: {str(e)}")
 
+    @staticmethod
+    def _read_stack(file_path: str):
+        """Open a TIFF file so frames are read on demand where possible."""
+        try:
+            return tifffile.memmap(file_path, mode='r')
+        except ValueError:
+            pass
+
+        # Compressed or tiled data can't be mapped; decode frames on
+        # demand when each page holds one frame, otherwise read it all
+        tif = tifffile.TiffFile(file_path)
+        series = tif.series[0]
+        if len(series.pages) > 1 and series.ndim == 3:
+            return _TiffPageStack(tif)
+        with tif:
+            return series.asarray()
+
+    @staticmethod
+    def _write_stack(file_path: str, stack):
+        """Save a stack and return it reopened from the saved file.
+
+        Stacks may be memory-mapped or read page by page from their source
+        file, and writing that file in place would corrupt them. The data is
+        written to a temporary file that then replaces the target, and the
+        stack is reopened so no mapping or file handle is left on the
+        replaced file.
+        """
+        temp_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            tifffile.imwrite(temp_path, np.array(stack))
+            os.replace(temp_path, file_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        saved = FilePanel._read_stack(file_path)
+        return saved if saved.ndim > 2 else saved[np.newaxis, ...]
+
+    @staticmethod
+    def _load_frame(stack: np.ndarray, frame: Optional[int] = None) -> np.ndarray:
+        """Read one frame of a (possibly memory-mapped) stack into memory."""
+        image = stack if frame is None else stack[frame]
+        if isinstance(image, np.memmap):
+            # Page the frame in once rather than on every analysis pass
+            return np.array(image)
+        return image
+
     def load_fluorescence(self):
         """Load fluorescence image or stack."""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -201,17 +288,17 @@ class FilePanel(QWidget):
             self.progress_bar.setValue(0)
 
             # Load image
-            image_stack = tifffile.imread(file_path)
+            image_stack = self._read_stack(file_path)
             self.progress_bar.setValue(50)
 
             # Process stack
             if image_stack.ndim > 2:
                 self.fluor_stack = image_stack
                 self.frame_spinner.setMaximum(len(image_stack) - 1)
-                current_image = image_stack[self.current_frame]
+                current_image = self._load_frame(image_stack, self.current_frame)
             else:
                 self.fluor_stack = image_stack[np.newaxis, ...]
-                current_image = image_stack
+                current_image = self._load_frame(image_stack)
 
             # Validate dimensions match cell mask if loaded
             if self.cell_stack is not None:
@@ -246,6 +333,14 @@ class FilePanel(QWidget):
             self.progress_bar.setVisible(False)
             QMessageBox.critical(self, "Error", f"Error loading fluorescence image: {str(e)}")
 
+    def _on_frame_spinner_changed(self, value: int):
+        """Restart the frame timer so only the last value is applied."""
+        self._frame_timer.start()
+
+    def _apply_frame_change(self):
+        """Switch to the frame currently shown in the spinner."""
+        self.change_frame(self.frame_spinner.value())
+
     def change_frame(self, frame_number: int):
         """Change the current frame number."""
         if frame_number == self.current_frame:
@@ -257,7 +352,7 @@ class FilePanel(QWidget):
         # Emit signals with new frame data
         if self.cell_stack is not None:
             cell_data = ImageData(
-                data=self.cell_stack[frame_number],
+                data=self._load_frame(self.cell_stack, frame_number),
                 filename=self.cell_label.text().replace("Loaded: ", ""),
                 is_stack=True,
                 current_frame=frame_number
@@ -266,7 +361,7 @@ class FilePanel(QWidget):
 
         if self.fluor_stack is not None:
             fluor_data = ImageData(
-                data=self.fluor_stack[frame_number],
+                data=self._load_frame(self.fluor_stack, frame_number),
                 filename=self.fluor_label.text().replace("Loaded: ", ""),
                 is_stack=True,
                 current_frame=frame_number
@@ -291,7 +386,7 @@ class FilePanel(QWidget):
 
         if file_path:
             try:
-                tifffile.imwrite(file_path, self.cell_stack)
+                self.cell_stack = self._write_stack(file_path, self.cell_stack)
                 QMessageBox.information(self, "Success", "Cell mask saved successfully")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error saving cell mask: {str(e)}")
@@ -310,7 +405,7 @@ class FilePanel(QWidget):
 
         if file_path:
             try:
-                tifffile.imwrite(file_path, self.fluor_stack)
+                self.fluor_stack = self._write_stack(file_path, self.fluor_stack)
                 QMessageBox.information(self, "Success", "Fluorescence image saved successfully")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Error saving fluorescence image: {str(e)}")
@@ -330,7 +425,7 @@ class FilePanel(QWidget):
         cell_data = None
         if self.cell_stack is not None:
             cell_data = ImageData(
-                data=self.cell_stack[self.current_frame],
+                data=self._load_frame(self.cell_stack, self.current_frame),
                 filename=self.cell_label.text().replace("Loaded: ", ""),
                 is_stack=self.cell_stack.ndim > 2,
                 current_frame=self.current_frame
@@ -339,7 +434,7 @@ class FilePanel(QWidget):
         fluor_data = None
         if self.fluor_stack is not None:
             fluor_data = ImageData(
-                data=self.fluor_stack[self.current_frame],
+                data=self._load_frame(self.fluor_stack, self.current_frame),
                 filename=self.fluor_label.text().replace("Loaded: ", ""),
                 is_stack=self.fluor_stack.ndim > 2,
                 current_frame=self.current_frame
@@ -370,111 +465,48 @@ class FilePanel(QWidget):
             total_frames = len(self.cell_stack)
 
             # Storage for frame-by-frame results
+            results = [None] * total_frames
+
+            if total_frames < self._PARALLEL_MIN_FRAMES or (os.cpu_count() or 1) < 2:
+                # Short stacks finish before worker processes would start
+                for frame in range(total_frames):
+                    # Update progress
+                    self.progress_bar.setValue(int((frame / total_frames) * 100))
+                    QApplication.processEvents()  # Keep UI responsive
+
+                    results[frame] = analyze_frame(
+                        *self._get_frame_data(frame),
+                        self.params,
+                        self.edge_detector,
+                        self.curvature_analyzer,
+                        self.fluorescence_analyzer
+                    )
+            else:
+                self._analyze_frames_parallel(results)
+
+            # Collect results in frame order
             all_curvatures = []
             all_intensities = []
             all_correlations = []
-
-            # Process each frame
-            for frame in range(total_frames):
-                # Update progress
-                self.progress_bar.setValue(int((frame / total_frames) * 100))
-                QApplication.processEvents()  # Keep UI responsive
-
-                # Get current frame data
-                cell_data = ImageData(
-                    data=self.cell_stack[frame],
-                    filename=self.cell_label.text().replace("Loaded: ", ""),
-                    is_stack=True,
-                    current_frame=frame
-                )
-
-                fluor_data = None
-                if self.fluor_stack is not None:
-                    fluor_data = ImageData(
-                        data=self.fluor_stack[frame],
-                        filename=self.fluor_label.text().replace("Loaded: ", ""),
-                        is_stack=True,
-                        current_frame=frame
-                    )
-
-                # Run edge detection
-                edge_data = self.edge_detector.detect_edge(cell_data)
-                if edge_data is None:
+            for result in results:
+                if result is None:
                     continue
-
-                # Generate sampling points
-                contour = edge_data.smoothed_contour if edge_data.smoothed_contour is not None else edge_data.contour
-                n_points = len(contour)
-                sample_indices = np.linspace(0, n_points-1, self.params.n_samples, dtype=int)
-
-                # Calculate intensities first (to get valid sampling points)
-                frame_intensities = []
-                valid_indices = []
-
-                if fluor_data is not None:
-                    for idx in sample_indices:
-                        # Get segment for normal calculation
-                        half_segment = self.params.edge_segment // 2
-                        segment_indices = np.arange(idx - half_segment, idx + half_segment + 1) % n_points
-                        segment = contour[segment_indices]
-
-                        intensity_data = self.fluorescence_analyzer._calculate_single_intensity(
-                            segment,  # Pass full segment for normal calculation
-                            fluor_data.data,
-                            cell_data.data,
-                            border_margin=20
-                        )
-
-                        if intensity_data is not None:
-                            frame_intensities.append(intensity_data['mean'])
-                            valid_indices.append(idx)
-
-                    if not valid_indices:
-                        continue
-
-                    # Now calculate curvature only for valid intensity points
-                    frame_curvatures = []
-                    for idx in valid_indices:
-                        half_segment = self.params.segment_length // 2
-                        segment_indices = np.arange(idx - half_segment, idx + half_segment + 1) % n_points
-                        segment = contour[segment_indices]
-
-                        curvature = self.curvature_analyzer._fit_circle_to_segment(segment)
-                        frame_curvatures.append(curvature)
-
-                    frame_intensities = np.array(frame_intensities)
-                    frame_curvatures = np.array(frame_curvatures)
-
-                    # Only keep points where curvature is valid
-                    valid_curv = frame_curvatures != 0
-                    if np.any(valid_curv):
-                        all_curvatures.append(frame_curvatures[valid_curv])
-                        all_intensities.append(frame_intensities[valid_curv])
-                        correlation = np.corrcoef(frame_curvatures[valid_curv],
-                                               frame_intensities[valid_curv])[0, 1]
-                        all_correlations.append(correlation)
-                else:
-                    # Calculate just curvature for all points
-                    frame_curvatures = []
-                    for idx in sample_indices:
-                        half_segment = self.params.segment_length // 2
-                        segment_indices = np.arange(idx - half_segment, idx + half_segment + 1) % n_points
-                        segment = contour[segment_indices]
-
-                        curvature = self.curvature_analyzer._fit_circle_to_segment(segment)
-                        if curvature != 0:
-                            frame_curvatures.append(curvature)
-
-                    if frame_curvatures:
-                        all_curvatures.append(np.array(frame_curvatures))
+                frame_curvatures, frame_intensities, correlation = result
+                all_curvatures.append(frame_curvatures)
+                if frame_intensities is not None:
+                    all_intensities.append(frame_intensities)
+                    all_correlations.append(correlation)
 
             # Show results window
             if all_curvatures:
-                print(f"Frame analysis complete:")
-                print(f"  Number of frames analyzed: {len(all_curvatures)}")
-                if all_intensities:
-                    print(f"  Points per frame: {[len(c) for c in all_curvatures]}")
-                    print(f"  Average correlation: {np.mean(all_correlations):.3f}")
+                if logger.isEnabledFor(logging.INFO):
+                    logger.info("Frame analysis complete: %d frames analyzed",
+                                len(all_curvatures))
+                    if all_intensities:
+                        logger.info("Points per frame: %s",
+                                    [len(c) for c in all_curvatures])
+                        logger.info("Average correlation: %.3f",
+                                    np.mean(all_correlations))
 
                 self.results_window = ResultsWindow(
                     all_curvatures=all_curvatures,
@@ -491,6 +523,62 @@ class FilePanel(QWidget):
         finally:
             self.progress_bar.setVisible(False)
 
+    def _get_frame_data(self, frame: int) -> Tuple[ImageData, Optional[ImageData]]:
+        """Read one frame of each loaded stack for batch analysis."""
+        cell_data = ImageData(
+            data=self._load_frame(self.cell_stack, frame),
+            filename=self.cell_label.text().replace("Loaded: ", ""),
+            is_stack=True,
+            current_frame=frame
+        )
+
+        fluor_data = None
+        if self.fluor_stack is not None:
+            fluor_data = ImageData(
+                data=self._load_frame(self.fluor_stack, frame),
+                filename=self.fluor_label.text().replace("Loaded: ", ""),
+                is_stack=True,
+                current_frame=frame
+            )
+
+        return cell_data, fluor_data
+
+    def _analyze_frames_parallel(self, results: List):
+        """Analyze all frames in worker processes, filling results in frame order."""
+        total_frames = len(results)
+
+        # Keep only a few frames in flight to bound memory. Workers are
+        # spawned: forking the threaded Qt process can deadlock
+        max_workers = min(os.cpu_count() or 1, total_frames)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        ) as executor:
+            pending = {}
+            next_frame = 0
+            completed = 0
+            while completed < total_frames:
+                while next_frame < total_frames and len(pending) < 2 * max_workers:
+                    future = executor.submit(
+                        analyze_frame,
+                        *self._get_frame_data(next_frame),
+                        self.params,
+                        self.edge_detector,
+                        self.curvature_analyzer,
+                        self.fluorescence_analyzer
+                    )
+                    pending[future] = next_frame
+                    next_frame += 1
+
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+                    completed += 1
+
+                # Update progress
+                self.progress_bar.setValue(int((completed / total_frames) * 100))
+                QApplication.processEvents()  # Keep UI responsive
+
     def _update_buttons(self):
         """Update the state of all buttons based on loaded data."""
         # Update save buttons
@@ -499,7 +587,3 @@ class FilePanel(QWidget):
 
         # Update batch analysis button
         self.analyze_stack_button.setEnabled(self.cell_stack is not None)
-
-        # Trigger analysis on the current frame if both files are loaded
-        if self.cell_stack is not None and self.fluor_stack is not None:
-            self.files_ready.emit()
@@ -2,7 +2,6 @@
 
 import sys
 import numpy as np
-import cv2
 from typing import List, Optional, Dict, Tuple
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
@@ -43,6 +42,9 @@ class MainWindow(QMainWindow):
         self.curvature_data = None
         self.fluorescence_data = None
 
+        # Last edge detection, reused while the mask and edge parameters are unchanged
+        self._edge_cache = None  # (cell_data, (min_size, smoothing_sigma), edge_data)
+
         self._init_ui()
 
     def _init_ui(self):
@@ -102,6 +104,7 @@ class MainWindow(QMainWindow):
         # Left side: Analysis parameters
         self.analysis_panel = AnalysisPanel(self.params)
         self.analysis_panel.parameters_changed.connect(self.update_analysis)
+        self.analysis_panel.display_changed.connect(self.update_display)
         layout.addWidget(self.analysis_panel)
 
         # Right side: Visualization
@@ -126,19 +129,13 @@ class MainWindow(QMainWindow):
         """Handle loaded cell mask."""
         self.cell_data = image_data
         self.statusBar().showMessage(f"Loaded cell mask: {image_data.filename}")
-
-        # Only run analysis if both files are loaded
-        if self.fluor_data is not None:
-            self.run_analysis()
+        # Analysis runs once on files_ready, after both images are updated
 
     def on_fluorescence_loaded(self, image_data: ImageData):
         """Handle loaded fluorescence image."""
         self.fluor_data = image_data
         self.statusBar().showMessage(f"Loaded fluorescence: {image_data.filename}")
-
-        # Only run analysis if both files are loaded
-        if self.cell_data is not None:
-            self.run_analysis()
+        # Analysis runs once on files_ready, after both images are updated
 
     def run_analysis(self):
         """Run the complete analysis pipeline."""
@@ -148,68 +145,76 @@ class MainWindow(QMainWindow):
 
         try:
             # Detect cell edge
-            self.edge_data = self.edge_detector.detect_edge(self.cell_data)
+            self.edge_data = self._detect_edge()
             if self.edge_data is None:
                 raise ValueError("Edge detection failed")
 
             # Create coordinator for sampling points
             coordinator = CoordinatedAnalysis(self.edge_data, self.params)
-            sample_indices = coordinator.generate_sampling_points()
+            sample_indices = coordinator.filter_border_points(
+                coordinator.generate_sampling_points(),
+                self.fluor_data.data.shape
+            )
 
             # Lists to store valid measurements
             valid_indices = []
             valid_points = []
             curvature_segments = []
+            segment_coords = []
             curvatures = []
             fluorescence_data = []
 
-            # Process each sample point
+            # Check point validity for both analyses
+            candidates = []
             for idx in sample_indices:
-                if self.fluor_data is not None:
-                    # Check point validity for both analyses
-                    is_valid, point_data = coordinator.check_point_validity(
-                        idx,
-                        self.fluor_data.data,
-                        self.cell_data.data
-                    )
-
-                    if not is_valid:
-                        continue
-
-                    # Calculate curvature for valid point
-                    segment = coordinator.contour[point_data['segment_indices']]
-                    curvature = self.curvature_analyzer._fit_circle_to_segment(segment)
-
-                    if curvature == 0:  # Skip if curvature calculation failed
-                        continue
-
-                    # Sample fluorescence
-                    rect_mask = np.zeros_like(self.fluor_data.data, dtype=np.uint8)
-                    cv2.fillPoly(rect_mask, [point_data['rect_coords']], 1)
-                    mask = rect_mask.astype(bool)
-                    fluor_values = self.fluor_data.data[mask]
-
-                    if len(fluor_values) == 0:
-                        continue
-
-                    # Store valid measurements
-                    valid_indices.append(idx)
-                    valid_points.append(point_data['center'])
-                    curvature_segments.append(point_data['segment_indices'])
-                    curvatures.append(curvature)
-
-                    intensity_data = {
-                        'mean': np.mean(fluor_values),
-                        'min': np.min(fluor_values),
-                        'max': np.max(fluor_values),
-                        'std': np.std(fluor_values),
-                        'rect_coords': point_data['rect_coords'],
-                        'raw_values': fluor_values,
-                        'normal': point_data['normal'],
-                        'center': point_data['center'],
-                        'interior_overlap': point_data['interior_overlap']
-                    }
-                    fluorescence_data.append(intensity_data)
+                is_valid, point_data = coordinator.check_point_validity(
+                    idx,
+                    self.fluor_data.data,
+                    self.cell_data.data
+                )
+                if is_valid:
+                    candidates.append((idx, point_data))
+
+            # Calculate curvature for all valid points at once
+            candidate_curvatures = []
+            if candidates:
+                candidate_segments = coordinator.contour[np.array(
+                    [point_data['segment_indices'] for _, point_data in candidates]
+                )]
+                candidate_curvatures = self.curvature_analyzer._fit_circles(
+                    candidate_segments
+                )
+
+            # Process each valid sample point
+            for (idx, point_data), curvature in zip(candidates, candidate_curvatures):
+                if curvature == 0:  # Skip if curvature calculation failed
+                    continue
+
+                # Fluorescence sampled during the validity check
+                fluor_values = point_data['fluor_values']
+
+                if len(fluor_values) == 0:
+                    continue
+
+                # Store valid measurements
+                valid_indices.append(idx)
+                valid_points.append(point_data['center'])
+                curvature_segments.append(point_data['segment_indices'])
+                segment_coords.append(self.edge_data.contour[point_data['segment_indices']])
+                curvatures.append(curvature)
+
+                intensity_data = {
+                    'mean': np.mean(fluor_values),
+                    'min': np.min(fluor_values),
+                    'max': np.max(fluor_values),
+                    'std': np.std(fluor_values),
+                    'rect_coords': point_data['rect_coords'],
+                    'raw_values': fluor_values,
+                    'normal': point_data['normal'],
+                    'center': point_data['center'],
+                    'interior_overlap': point_data['interior_overlap']
+                }
+                fluorescence_data.append(intensity_data)
 
             # Create data objects for valid measurements
             valid_indices = np.array(valid_indices)
@@ -224,7 +229,8 @@ class MainWindow(QMainWindow):
                 curvatures=np.array(curvatures),
                 segment_indices=curvature_segments,
                 ref_curvatures=self.curvature_analyzer.ref_curvatures,
-                radius_scale=self.params.radius_scale
+                radius_scale=self.params.radius_scale,
+                segments=segment_coords
             )
 
             # Create fluorescence data if available
@@ -250,6 +256,19 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Error", f"Analysis failed: {e}")
             self.statusBar().showMessage("Analysis failed")
 
+    def _detect_edge(self) -> Optional[EdgeData]:
+        """Detect the cell edge, reusing the cached result when possible."""
+        key = (self.params.min_size, self.params.smoothing_sigma)
+        if (self._edge_cache is not None and
+            self._edge_cache[0] is self.cell_data and
+            self._edge_cache[1] == key):
+            return self._edge_cache[2]
+
+        edge_data = self.edge_detector.detect_edge(self.cell_data)
+        if edge_data is not None:
+            self._edge_cache = (self.cell_data, key, edge_data)
+        return edge_data
+
     def update_visualization(self):
         """Update all visualization panels."""
         if self.edge_data is None:
@@ -265,6 +284,10 @@ class MainWindow(QMainWindow):
             params=self.params
         )
 
+    def update_display(self):
+        """Update the main view when only visualization parameters change."""
+        self.visualization_panel.update_display(self.params)
+
     def update_debug_info(self):
         """Update debug information display."""
         if self.edge_data is None:
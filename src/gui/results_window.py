@@ -6,9 +6,50 @@ from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
     QPushButton, QLabel, QTabWidget, QFileDialog
 )
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.figure import Figure
 import pandas as pd
+import xlsxwriter
+
+def _pack_frames(frames):
+    """Pack per-frame arrays into one contiguous float32 buffer."""
+    return np.concatenate(frames).astype(np.float32)
+
+class _FigureSignals(QObject):
+    """Signals for figure render tasks."""
+    finished = pyqtSignal(str, object)  # Emits (tab key, Figure)
+    failed = pyqtSignal(str, str)  # Emits (tab key, error message)
+
+class _FigureRenderTask(QRunnable):
+    """Build a Figure off the UI thread with the given plot function."""
+    
+    def __init__(self, key, figsize, plot_function):
+        super().__init__()
+        self.key = key
+        self.figsize = figsize
+        self.plot_function = plot_function
+        self.signals = _FigureSignals()
+        
+    def run(self):
+        # Plain Agg canvas; the Qt canvas is attached on the UI thread
+        fig = Figure(figsize=self.figsize)
+        FigureCanvasAgg(fig)
+        try:
+            self.plot_function(fig)
+        except Exception as e:
+            # Exceptions must not escape run(); report them to the UI thread
+            try:
+                self.signals.failed.emit(self.key, str(e))
+            except RuntimeError:
+                pass
+            return
+        try:
+            self.signals.finished.emit(self.key, fig)
+        except RuntimeError:
+            # Results window was destroyed before rendering finished
+            pass
 
 class ResultsWindow(QMainWindow):
     """Window to display batch analysis results."""
@@ -22,6 +63,23 @@ class ResultsWindow(QMainWindow):
         self.all_intensities = all_intensities
         self.all_correlations = all_correlations
         
+        # Per-frame means once, from the full-precision data so they match
+        # the exported raw values
+        self._curv_means = np.array([np.mean(c) for c in all_curvatures])
+        self._int_means = np.array([np.mean(i) for i in all_intensities])
+
+        # Pack points into contiguous float32 buffers for the point-level
+        # statistics and the pooled correlation plot
+        self._curv_concat = _pack_frames(all_curvatures)
+        self._int_concat = _pack_frames(all_intensities)
+        
+        # Figures are built in a background thread and attached when ready;
+        # a single worker keeps Matplotlib calls from running concurrently
+        self._render_pool = QThreadPool(self)
+        self._render_pool.setMaxThreadCount(1)
+        self._placeholders = {}
+        self._canvases = {}
+        
         # Create central widget and layout
         central_widget = QWidget()
         self.setCentralWidget(central_widget)
@@ -45,6 +103,46 @@ class ResultsWindow(QMainWindow):
         export_layout = self._create_export_section()
         layout.addLayout(export_layout)
         
+        # Start rendering the figures
+        self._start_rendering()
+        
+    def _add_placeholder(self, key, layout):
+        """Add a placeholder that is replaced by the figure canvas once rendered."""
+        placeholder = QLabel("Rendering...")
+        placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(placeholder, stretch=1)
+        self._placeholders[key] = (layout, placeholder)
+        
+    def _figure_specs(self):
+        """Return (tab key, figure size, plot function, export filename) per figure."""
+        return [
+            ('summary', (10, 6), self._plot_summary, 'summary_plots.png'),
+            ('frames', (10, 8), self._render_frame_analysis, 'frame_analysis.png'),
+            ('correlation', (10, 8), self._plot_correlation_analysis, 'correlation_analysis.png')
+        ]
+        
+    def _start_rendering(self):
+        """Submit one render task per figure to the thread pool."""
+        for key, figsize, plot_function, _ in self._figure_specs():
+            task = _FigureRenderTask(key, figsize, plot_function)
+            task.signals.finished.connect(self._on_figure_rendered)
+            task.signals.failed.connect(self._on_figure_failed)
+            self._render_pool.start(task)
+            
+    def _on_figure_rendered(self, key, fig):
+        """Swap a tab's placeholder for a canvas showing the rendered figure."""
+        layout, placeholder = self._placeholders.pop(key)
+        canvas = FigureCanvas(fig)
+        layout.replaceWidget(placeholder, canvas)
+        placeholder.deleteLater()
+        self._canvases[key] = canvas
+        canvas.draw_idle()
+        
+    def _on_figure_failed(self, key, message):
+        """Show a rendering error in the tab's placeholder."""
+        _, placeholder = self._placeholders[key]
+        placeholder.setText(f"Error creating plot: {message}")
+        
     def _create_summary_tab(self):
         """Create summary statistics view."""
         tab = QWidget()
@@ -53,13 +151,8 @@ class ResultsWindow(QMainWindow):
         # Calculate statistics
         stats = self._calculate_summary_statistics()
         
-        # Create summary figure
-        fig = Figure(figsize=(10, 6))
-        canvas = FigureCanvas(fig)
-        layout.addWidget(canvas)
-        
-        # Plot summary data
-        self._plot_summary(fig)
+        # Summary figure is rendered in the background
+        self._add_placeholder('summary', layout)
         
         # Add statistics text
         stats_text = self._format_statistics(stats)
@@ -72,38 +165,14 @@ class ResultsWindow(QMainWindow):
         """Create frame-by-frame analysis plots."""
         tab = QWidget()
         layout = QVBoxLayout(tab)
-        
-        fig = Figure(figsize=(10, 8))
-        canvas = FigureCanvas(fig)
-        layout.addWidget(canvas)
-        
-        # Create subplots
-        gs = fig.add_gridspec(2, 1)
-        ax1 = fig.add_subplot(gs[0])
-        ax2 = fig.add_subplot(gs[1])
-        
-        # Plot frame-by-frame data
-        self._plot_frame_analysis(ax1, ax2)
-        
-        fig.tight_layout()
-        canvas.draw()
-        
+        self._add_placeholder('frames', layout)
         return tab
         
     def _create_correlation_tab(self):
         """Create correlation analysis view."""
         tab = QWidget()
         layout = QVBoxLayout(tab)
-        
-        fig = Figure(figsize=(10, 8))
-        canvas = FigureCanvas(fig)
-        layout.addWidget(canvas)
-        
-        # Plot correlation data
-        self._plot_correlation_analysis(fig)
-        
-        canvas.draw()
-        
+        self._add_placeholder('correlation', layout)
         return tab
         
     def _create_export_section(self):
@@ -128,12 +197,20 @@ class ResultsWindow(QMainWindow):
         return export_layout
         
     def _calculate_summary_statistics(self):
-        """Calculate summary statistics for all measurements."""
+        """Calculate summary statistics for all measurements.
+        
+        The *_mean/*_std entries are taken over per-frame means; the *_point_*
+        entries are taken over all individual measurement points.
+        """
         stats = {
-            'curvature_mean': np.mean([np.mean(c) for c in self.all_curvatures]),
-            'curvature_std': np.std([np.mean(c) for c in self.all_curvatures]),
-            'intensity_mean': np.mean([np.mean(i) for i in self.all_intensities]),
-            'intensity_std': np.std([np.mean(i) for i in self.all_intensities]),
+            'curvature_mean': np.mean(self._curv_means),
+            'curvature_std': np.std(self._curv_means),
+            'intensity_mean': np.mean(self._int_means),
+            'intensity_std': np.std(self._int_means),
+            'curvature_point_mean': self._curv_concat.mean(dtype=np.float64),
+            'curvature_point_std': self._curv_concat.std(dtype=np.float64),
+            'intensity_point_mean': self._int_concat.mean(dtype=np.float64),
+            'intensity_point_std': self._int_concat.std(dtype=np.float64),
             'correlation_mean': np.mean(self.all_correlations),
             'correlation_std': np.std(self.all_correlations),
             'n_frames': len(self.all_curvatures)
@@ -148,6 +225,11 @@ class ResultsWindow(QMainWindow):
         Curvature: {stats['curvature_mean']:.3f} ± {stats['curvature_std']:.3f} nm⁻¹
         Intensity: {stats['intensity_mean']:.1f} ± {stats['intensity_std']:.1f} a.u.
         Correlation: {stats['correlation_mean']:.3f} ± {stats['correlation_std']:.3f}
+        (mean ± SD over frames)
+        
+        All Points:
+        Curvature: {stats['curvature_point_mean']:.3f} ± {stats['curvature_point_std']:.3f} nm⁻¹
+        Intensity: {stats['intensity_point_mean']:.1f} ± {stats['intensity_point_std']:.1f} a.u.
         
         Total Frames Analyzed: {stats['n_frames']}
         """
@@ -159,28 +241,34 @@ class ResultsWindow(QMainWindow):
         ax2 = fig.add_subplot(gs[1])
         
         # Plot distributions
-        ax1.hist([np.mean(c) for c in self.all_curvatures], bins=20)
+        ax1.hist(self._curv_means, bins=20)
         ax1.set_xlabel('Mean Curvature (nm⁻¹)')
         ax1.set_ylabel('Count')
         
-        ax2.hist([np.mean(i) for i in self.all_intensities], bins=20)
+        ax2.hist(self._int_means, bins=20)
         ax2.set_xlabel('Mean Intensity (a.u.)')
         ax2.set_ylabel('Count')
         
         fig.tight_layout()
         
+    def _render_frame_analysis(self, fig):
+        """Create frame analysis subplots on a figure."""
+        gs = fig.add_gridspec(2, 1)
+        ax1 = fig.add_subplot(gs[0])
+        ax2 = fig.add_subplot(gs[1])
+        self._plot_frame_analysis(ax1, ax2)
+        fig.tight_layout()
+        
     def _plot_frame_analysis(self, ax1, ax2):
         """Plot frame-by-frame analysis."""
         frames = range(len(self.all_curvatures))
         
         # Plot mean curvature per frame
-        curvature_means = [np.mean(c) for c in self.all_curvatures]
-        ax1.plot(frames, curvature_means, 'b-')
+        ax1.plot(frames, self._curv_means, 'b-')
         ax1.set_ylabel('Mean Curvature (nm⁻¹)')
         
         # Plot mean intensity per frame
-        intensity_means = [np.mean(i) for i in self.all_intensities]
-        ax2.plot(frames, intensity_means, 'r-')
+        ax2.plot(frames, self._int_means, 'r-')
         ax2.set_ylabel('Mean Intensity (a.u.)')
         ax2.set_xlabel('Frame Number')
         
@@ -189,8 +277,8 @@ class ResultsWindow(QMainWindow):
         ax = fig.add_subplot(111)
         
         # Combine all frame data
-        all_curvatures = np.concatenate(self.all_curvatures)
-        all_intensities = np.concatenate(self.all_intensities)
+        all_curvatures = self._curv_concat
+        all_intensities = self._int_concat
         
         # Create scatter plot
         ax.scatter(all_curvatures, all_intensities, alpha=0.5)
@@ -207,26 +295,46 @@ class ResultsWindow(QMainWindow):
         corr = np.corrcoef(all_curvatures, all_intensities)[0, 1]
         ax.set_title(f'Curvature vs Intensity (r = {corr:.3f})')
         
+    def _build_raw_data(self):
+        """Build per-point rows (frame, curvature, intensity, correlation) for export."""
+        data = {
+            'Frame': [],
+            'Curvature': [],
+            'Intensity': [],
+            'Correlation': []
+        }
+        
+        for i, (curvatures, intensities, correlation) in enumerate(zip(
+            self.all_curvatures, self.all_intensities, self.all_correlations
+        )):
+            data['Frame'].extend([i] * len(curvatures))
+            data['Curvature'].extend(curvatures)
+            data['Intensity'].extend(intensities)
+            data['Correlation'].extend([correlation] * len(curvatures))
+            
+        return data
+        
+    @staticmethod
+    def _write_sheet(workbook, name, columns, rows):
+        """Write a header and rows to a new worksheet, strictly in row order."""
+        worksheet = workbook.add_worksheet(name)
+        worksheet.write_row(0, 0, columns)
+        for row_idx, row in enumerate(rows, start=1):
+            # NaN (e.g. the correlation of a single-point frame) is left
+            # blank, as pandas wrote it
+            worksheet.write_row(row_idx, 0, [
+                None if isinstance(value, (float, np.floating)) and np.isnan(value)
+                else value
+                for value in row
+            ])
+            
     def export_csv(self):
         """Export data to CSV file."""
         filename, _ = QFileDialog.getSaveFileName(
             self, "Save CSV", "", "CSV files (*.csv)")
             
         if filename:
-            data = {
-                'Frame': [],
-                'Curvature': [],
-                'Intensity': [],
-                'Correlation': []
-            }
-            
-            for i in range(len(self.all_curvatures)):
-                data['Frame'].extend([i] * len(self.all_curvatures[i]))
-                data['Curvature'].extend(self.all_curvatures[i])
-                data['Intensity'].extend(self.all_intensities[i])
-                data['Correlation'].extend([self.all_correlations[i]] * len(self.all_curvatures[i]))
-                
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(self._build_raw_data())
             df.to_csv(filename, index=False)
             
     def export_excel(self):
@@ -235,35 +343,33 @@ class ResultsWindow(QMainWindow):
             self, "Save Excel", "", "Excel files (*.xlsx)")
             
         if filename:
-            with pd.ExcelWriter(filename) as writer:
-                # Raw data sheet
-                raw_data = {
-                    'Frame': [],
-                    'Curvature': [],
-                    'Intensity': [],
-                    'Correlation': []
-                }
-                
-                for i in range(len(self.all_curvatures)):
-                    raw_data['Frame'].extend([i] * len(self.all_curvatures[i]))
-                    raw_data['Curvature'].extend(self.all_curvatures[i])
-                    raw_data['Intensity'].extend(self.all_intensities[i])
-                    raw_data['Correlation'].extend([self.all_correlations[i]] * len(self.all_curvatures[i]))
-                    
-                pd.DataFrame(raw_data).to_excel(writer, sheet_name='Raw Data', index=False)
+            # constant_memory streams each row to disk once it is complete, so
+            # every sheet must be written row by row (pandas writes by column)
+            workbook = xlsxwriter.Workbook(
+                filename, {'constant_memory': True, 'nan_inf_to_errors': True}
+            )
+            try:
+                # Raw data sheet (largest) first
+                raw_data = self._build_raw_data()
+                self._write_sheet(workbook, 'Raw Data', list(raw_data.keys()),
+                                  zip(*raw_data.values()))
                 
                 # Summary statistics sheet
                 stats = self._calculate_summary_statistics()
-                pd.DataFrame([stats]).to_excel(writer, sheet_name='Summary Stats')
+                self._write_sheet(workbook, 'Summary Stats', [''] + list(stats.keys()),
+                                  [[0] + list(stats.values())])
                 
                 # Frame statistics sheet
                 frame_stats = {
                     'Frame': range(len(self.all_curvatures)),
-                    'Mean Curvature': [np.mean(c) for c in self.all_curvatures],
-                    'Mean Intensity': [np.mean(i) for i in self.all_intensities],
+                    'Mean Curvature': self._curv_means,
+                    'Mean Intensity': self._int_means,
                     'Correlation': self.all_correlations
                 }
-                pd.DataFrame(frame_stats).to_excel(writer, sheet_name='Frame Stats', index=False)
+                self._write_sheet(workbook, 'Frame Stats', list(frame_stats.keys()),
+                                  zip(*frame_stats.values()))
+            finally:
+                workbook.close()
                 
     def export_figures(self):
         """Export figures in publication-ready format."""
@@ -271,20 +377,16 @@ class ResultsWindow(QMainWindow):
             self, "Select Directory for Figures")
             
         if directory:
-            # Export summary figure
-            fig = Figure(figsize=(10, 6))
-            self._plot_summary(fig)
-            fig.savefig(f"{directory}/summary_plots.png", dpi=300, bbox_inches='tight')
-            
-            # Export frame analysis figure
-            fig = Figure(figsize=(10, 8))
-            gs = fig.add_gridspec(2, 1)
-            ax1 = fig.add_subplot(gs[0])
-            ax2 = fig.add_subplot(gs[1])
-            self._plot_frame_analysis(ax1, ax2)
-            fig.savefig(f"{directory}/frame_analysis.png", dpi=300, bbox_inches='tight')
+            # Let background renders finish so Matplotlib only runs here
+            self._render_pool.waitForDone()
             
-            # Export correlation figure
-            fig = Figure(figsize=(10, 8))
-            self._plot_correlation_analysis(fig)
-            fig.savefig(f"{directory}/correlation_analysis.png", dpi=300, bbox_inches='tight')
\ No newline at end of file
+            for key, figsize, plot_function, export_name in self._figure_specs():
+                # Reuse the on-screen figure; rebuild only if it is still rendering
+                canvas = self._canvases.get(key)
+                if canvas is not None:
+                    fig = canvas.figure
+                else:
+                    fig = Figure(figsize=figsize)
+                    FigureCanvasAgg(fig)
+                    plot_function(fig)
+                fig.savefig(f"{directory}/{export_name}", dpi=300, bbox_inches='tight')
@@ -3,7 +3,7 @@
 
 import numpy as np
 import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.colors import LinearSegmentedColormap
@@ -13,12 +13,29 @@ from typing import Optional
 from ..utils.data_structures import (
     ImageData, EdgeData, CurvatureData, FluorescenceData, AnalysisParameters
 )
+from ..utils.image_processing import ImageProcessor
 
 class VisualizationPanel(QWidget):
     """Panel for visualization of analysis results."""
 
     def __init__(self):
         super().__init__()
+        self._profile_cache = None  # (fluorescence_data, curvature_data, target, series)
+
+        # Tabs are replotted lazily, when they are next shown
+        self._plot_args = None  # Arguments of the latest plot_results call
+        self._dirty_canvases = set()  # Canvases whose figure is out of date
+
+        # Main view artists updated in place on display-only changes
+        self._main_ax = None
+        self._background_image = None
+        self._edge_line = None
+        self._curvature_lines = None
+        self._rect_collection = None
+        self._overlay_artists = []  # Animated sampling rectangles and normals
+        self._display_state = None  # (background_alpha, show_edge, line_width)
+        self._main_background = None  # Cached canvas without the overlay
+
         self._init_ui()
 
     def _init_ui(self):
@@ -32,17 +49,24 @@ class VisualizationPanel(QWidget):
         self.main_fig = Figure(figsize=(8, 8))
         self.main_canvas = FigureCanvas(self.main_fig)
         self.tab_widget.addTab(self.main_canvas, "Main View")
+        self.main_canvas.mpl_connect('draw_event', self._on_main_draw)
 
         # Create correlation plot figure
         self.corr_fig = Figure(figsize=(8, 8))
         self.corr_canvas = FigureCanvas(self.corr_fig)
+        self.corr_ax = self.corr_fig.add_subplot(111)
         self.tab_widget.addTab(self.corr_canvas, "Correlation")
 
         # Create intensity profile figure
         self.profile_fig = Figure(figsize=(8, 8))
         self.profile_canvas = FigureCanvas(self.profile_fig)
+
+        # Two subplots sharing x axis, cleared rather than recreated on replot
+        self.intensity_ax = self.profile_fig.add_subplot(211)  # Top plot for intensity
+        self.curvature_ax = self.profile_fig.add_subplot(212, sharex=self.intensity_ax)  # Bottom plot for curvature
         self.tab_widget.addTab(self.profile_canvas, "Intensity Profile")
 
+        self.tab_widget.currentChanged.connect(self._refresh_current_tab)
         layout.addWidget(self.tab_widget)
 
         # Create custom colormaps
@@ -58,20 +82,43 @@ class VisualizationPanel(QWidget):
         fluorescence_data: Optional[FluorescenceData],
         params: AnalysisParameters
         ):
-        """Update all visualizations with new results."""
-        self._plot_main_view(
+        """Update all visualizations with new results.
+
+        Only the visible tab is replotted immediately; the others are
+        marked out of date and replotted when selected.
+        """
+        self._plot_args = (
             cell_data, fluor_data, edge_data,
             curvature_data, fluorescence_data, params
         )
 
+        self._dirty_canvases = {self.main_canvas}
         if curvature_data is not None and fluorescence_data is not None:
+            self._dirty_canvases.update((self.corr_canvas, self.profile_canvas))
+
+        self._refresh_current_tab()
+
+    def _refresh_current_tab(self):
+        """Replot the visible tab if its figure is out of date."""
+        canvas = self.tab_widget.currentWidget()
+        if canvas not in self._dirty_canvases:
+            return
+        self._dirty_canvases.discard(canvas)
+
+        (cell_data, fluor_data, edge_data,
+         curvature_data, fluorescence_data, params) = self._plot_args
+
+        if canvas is self.main_canvas:
+            self._plot_main_view(
+                cell_data, fluor_data, edge_data,
+                curvature_data, fluorescence_data, params
+            )
+        elif canvas is self.corr_canvas:
             self._plot_correlation(curvature_data, fluorescence_data)
+        else:
             self._plot_intensity_profile(fluorescence_data, curvature_data)
 
-        # Refresh all canvases
-        self.main_canvas.draw()
-        self.corr_canvas.draw()
-        self.profile_canvas.draw()
+        canvas.draw()
 
     def _plot_main_view(
         self,
@@ -85,25 +132,36 @@ class VisualizationPanel(QWidget):
         """Plot main analysis view."""
         self.main_fig.clear()
         ax = self.main_fig.add_subplot(111)
+        self._main_ax = ax
+        self._curvature_lines = None
+        self._rect_collection = None
+        self._overlay_artists = []
+        self._main_background = None
+        self._display_state = (params.background_alpha, params.show_edge, params.line_width)
 
         # Show background image
         if fluor_data is not None:
-            ax.imshow(fluor_data.data, cmap='gray',
+            # Clip the display range so a few hot pixels don't darken the frame
+            vmin, vmax = ImageProcessor.percentile_range(fluor_data.data)
+            if vmax <= vmin:
+                vmin = vmax = None
+            self._background_image = ax.imshow(fluor_data.data, cmap='gray',
+                     vmin=vmin, vmax=vmax,
                      alpha=params.background_alpha)
         else:
-            ax.imshow(cell_data.data, cmap='gray',
+            self._background_image = ax.imshow(cell_data.data, cmap='gray',
                      alpha=params.background_alpha)
 
-        # Show cell edge if enabled
-        if params.show_edge:
-            if edge_data.smoothed_contour is not None:
-                ax.plot(edge_data.smoothed_contour[:, 0],
-                       edge_data.smoothed_contour[:, 1],
-                       'y-', linewidth=1, alpha=0.8)
-            else:
-                ax.plot(edge_data.contour[:, 0],
-                       edge_data.contour[:, 1],
-                       'y-', linewidth=1, alpha=0.8)
+        # Show cell edge (visibility is toggled without replotting)
+        if edge_data.smoothed_contour is not None:
+            self._edge_line, = ax.plot(edge_data.smoothed_contour[:, 0],
+                   edge_data.smoothed_contour[:, 1],
+                   'y-', linewidth=1, alpha=0.8)
+        else:
+            self._edge_line, = ax.plot(edge_data.contour[:, 0],
+                   edge_data.contour[:, 1],
+                   'y-', linewidth=1, alpha=0.8)
+        self._edge_line.set_visible(params.show_edge)
 
         # Plot curvature data if available
         if curvature_data is not None:
@@ -113,16 +171,19 @@ class VisualizationPanel(QWidget):
             norm = plt.Normalize(vmin=-max_abs_curvature,
                                vmax=max_abs_curvature)
 
-            # Plot segments with curvature coloring
-            for point, curvature, indices in zip(
-                curvature_data.points,
-                curvature_data.curvatures,
-                curvature_data.segment_indices
-            ):
-                segment = edge_data.contour[indices]
-                color = self.curvature_cmap(norm(curvature))
-                ax.plot(segment[:, 0], segment[:, 1],
-                       color=color, linewidth=params.line_width)
+            # Plot segments with curvature coloring as a single collection
+            segments = curvature_data.segments
+            if segments is None:
+                segments = [edge_data.contour[indices]
+                            for indices in curvature_data.segment_indices]
+            self._curvature_lines = LineCollection(
+                segments,
+                colors=self.curvature_cmap(norm(curvature_data.curvatures)),
+                linewidths=params.line_width,
+                capstyle='projecting',  # Match the Line2D defaults
+                joinstyle='round'
+            )
+            ax.add_collection(self._curvature_lines)
 
             # Add colorbar for curvature
             sm = plt.cm.ScalarMappable(cmap=self.curvature_cmap, norm=norm)
@@ -153,29 +214,29 @@ class VisualizationPanel(QWidget):
             max_val = np.percentile(mean_intensities, 99)
             norm = plt.Normalize(vmin=min_val, vmax=max_val)
 
-            # Plot sampling rectangles
-            for i, (data, rect_coords) in enumerate(zip(
-                fluorescence_data.sampling_points,
-                fluorescence_data.sampling_regions
-            )):
-                color = plt.cm.viridis(norm(data['mean']))
-
-                # Create and add rectangle patch
-                poly = patches.Polygon(
-                    rect_coords,
-                    facecolor=color,
-                    alpha=params.rectangle_alpha,
-                    edgecolor=color
+            # Plot sampling rectangles as one collection; it is animated so
+            # opacity changes can be blitted over a cached background
+            colors = plt.cm.viridis(norm(mean_intensities))
+            self._rect_collection = PolyCollection(
+                fluorescence_data.sampling_regions,
+                facecolors=colors,
+                edgecolors=colors,
+                alpha=params.rectangle_alpha,
+                animated=True
+            )
+            ax.add_collection(self._rect_collection)
+            self._overlay_artists.append(self._rect_collection)
+
+            # Draw normal vectors
+            if len(fluorescence_data.sampling_points) > 0:
+                centers = fluorescence_data.sampling_coordinates
+                end_points = centers + fluorescence_data.normal_vectors * params.vector_depth
+                vector_lines = LineCollection(
+                    np.stack([centers, end_points], axis=1),
+                    colors='r', linewidths=0.5, alpha=0.5, animated=True
                 )
-                ax.add_patch(poly)
-
-                # Draw normal vector if available
-                if 'normal' in data and 'center' in data:
-                    vector_length = params.vector_depth
-                    end_point = data['center'] + data['normal'] * vector_length
-                    ax.plot([data['center'][0], end_point[0]],
-                           [data['center'][1], end_point[1]],
-                           'r-', linewidth=0.5, alpha=0.5)
+                ax.add_collection(vector_lines)
+                self._overlay_artists.append(vector_lines)
 
             # Add colorbar for fluorescence
             sm = plt.cm.ScalarMappable(cmap='viridis', norm=norm)
@@ -186,14 +247,49 @@ class VisualizationPanel(QWidget):
         ax.set_title('PIEZO1 Analysis')
         ax.set_aspect('equal')
 
+    def _on_main_draw(self, event):
+        """Cache the main view without its overlay, then draw the overlay on top."""
+        if self._main_ax is None:
+            return
+        if not event.canvas.is_saving():
+            self._main_background = self.main_canvas.copy_from_bbox(self.main_fig.bbox)
+        # Draw onto the event's renderer so savefig output includes the overlay
+        for artist in self._overlay_artists:
+            artist.draw(event.renderer)
+
+    def update_display(self, params: AnalysisParameters):
+        """Apply visualization parameter changes to the existing main view."""
+        if self._main_ax is None or self.main_canvas in self._dirty_canvases:
+            # Nothing shown yet, or it will be replotted with these params
+            return
+
+        if self._rect_collection is not None:
+            self._rect_collection.set_alpha(params.rectangle_alpha)
+
+        display_state = (params.background_alpha, params.show_edge, params.line_width)
+        if display_state == self._display_state and self._main_background is not None:
+            # Only the overlay changed: blit it over the cached background
+            self.main_canvas.restore_region(self._main_background)
+            for artist in self._overlay_artists:
+                self._main_ax.draw_artist(artist)
+            self.main_canvas.blit(self.main_fig.bbox)
+            return
+
+        self._display_state = display_state
+        self._background_image.set_alpha(params.background_alpha)
+        self._edge_line.set_visible(params.show_edge)
+        if self._curvature_lines is not None:
+            self._curvature_lines.set_linewidth(params.line_width)
+        self.main_canvas.draw_idle()
+
     def _plot_correlation(
         self,
         curvature_data: CurvatureData,
         fluorescence_data: FluorescenceData
     ):
         """Plot correlation between curvature and fluorescence."""
-        self.corr_fig.clear()
-        ax = self.corr_fig.add_subplot(111)
+        ax = self.corr_ax
+        ax.cla()
 
         # Get valid data points (non-zero curvature)
         mask = curvature_data.curvatures != 0
@@ -217,39 +313,116 @@ class VisualizationPanel(QWidget):
         ax.set_title(f'Curvature vs Intensity (r = {corr_coef:.3f})')
         ax.grid(True, alpha=0.3)
 
+    @staticmethod
+    def _downsample_minmax(x, y, target=2000):
+        """Reduce a series to block-wise min/max pairs, preserving its envelope."""
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        n = len(y)
+        if n <= target:
+            return x, y
+
+        # Pad the last block with its edge value so every block has equal size
+        n_blocks = max(target // 2, 1)
+        block = int(np.ceil(n / n_blocks))
+        n_blocks = int(np.ceil(n / block))
+        blocks = np.pad(y, (0, n_blocks * block - n), mode='edge').reshape(n_blocks, block)
+
+        # Keep the min and max of each block in their original order
+        idx_min = blocks.argmin(axis=1)
+        idx_max = blocks.argmax(axis=1)
+        base = np.arange(n_blocks) * block
+        idx = np.column_stack((base + np.minimum(idx_min, idx_max),
+                               base + np.maximum(idx_min, idx_max))).ravel()
+        idx = np.minimum(idx, n - 1)
+        return x[idx], y[idx]
+
+    @staticmethod
+    def _downsample_band(x, lower, upper, target=2000):
+        """Reduce a filled band to a block-wise envelope (min of lower, max of upper)."""
+        x = np.asarray(x)
+        lower = np.asarray(lower, dtype=float)
+        upper = np.asarray(upper, dtype=float)
+        n = len(x)
+        if n <= target:
+            return x, lower, upper
+
+        n_blocks = max(target // 2, 1)
+        block = int(np.ceil(n / n_blocks))
+        n_blocks = int(np.ceil(n / block))
+        pad = n_blocks * block - n
+        block_lower = np.pad(lower, (0, pad), mode='edge').reshape(n_blocks, block).min(axis=1)
+        block_upper = np.pad(upper, (0, pad), mode='edge').reshape(n_blocks, block).max(axis=1)
+
+        # Each block spans from its first to its last position
+        starts = np.arange(n_blocks) * block
+        ends = np.minimum(starts + block - 1, n - 1)
+        band_x = np.column_stack((x[starts], x[ends])).ravel()
+        return band_x, np.repeat(block_lower, 2), np.repeat(block_upper, 2)
+
+    def _get_profile_series(
+        self,
+        fluorescence_data: FluorescenceData,
+        curvature_data: Optional[CurvatureData]
+        ) -> dict:
+        """Get (downsampled) profile series, cached per result set and canvas width."""
+        # Plot roughly two points per horizontal pixel of the canvas
+        target = max(2 * self.profile_canvas.width(), 200)
+        cache = self._profile_cache
+        if (cache is not None and cache[0] is fluorescence_data
+                and cache[1] is curvature_data and cache[2] == target):
+            return cache[3]
+
+        positions = np.arange(len(fluorescence_data.intensity_values))
+        intensities = fluorescence_data.intensity_values
+        min_values = fluorescence_data.min_intensities
+        max_values = fluorescence_data.max_intensities
+        std_values = fluorescence_data.std_intensities
+
+        series = {
+            'intensity': self._downsample_minmax(positions, intensities, target),
+            'range': self._downsample_band(positions, min_values, max_values, target),
+            'std': self._downsample_band(positions, intensities - std_values,
+                                         intensities + std_values, target),
+            'curvature': None
+        }
+        if curvature_data is not None:
+            series['curvature'] = self._downsample_minmax(
+                positions, curvature_data.curvatures, target)
+
+        self._profile_cache = (fluorescence_data, curvature_data, target, series)
+        return series
+
     def _plot_intensity_profile(
         self,
         fluorescence_data: FluorescenceData,
         curvature_data: Optional[CurvatureData] = None
         ):
         """Plot intensity and curvature profiles along membrane."""
-        self.profile_fig.clear()
-
-        # Create two subplots sharing x axis
-        ax1 = self.profile_fig.add_subplot(211)  # Top plot for intensity
-        ax2 = self.profile_fig.add_subplot(212, sharex=ax1)  # Bottom plot for curvature
+        ax1, ax2 = self.intensity_ax, self.curvature_ax
+        ax1.cla()
+        ax2.cla()
 
-        # Plot intensity data
-        positions = np.arange(len(fluorescence_data.intensity_values))
+        # Long membranes are reduced to the canvas resolution before plotting
+        series = self._get_profile_series(fluorescence_data, curvature_data)
 
         # Mean intensity
-        ax1.plot(positions, fluorescence_data.intensity_values,
+        positions, intensities = series['intensity']
+        ax1.plot(positions, intensities,
                 'b-', linewidth=2, label='Mean Intensity')
 
         # Min and max intensities
-        min_values = [data['min'] for data in fluorescence_data.sampling_points]
-        max_values = [data['max'] for data in fluorescence_data.sampling_points]
-
-        ax1.fill_between(positions, min_values, max_values,
+        band_x, min_values, max_values = series['range']
+        ax1.fill_between(band_x, min_values, max_values,
                         alpha=0.2, color='blue',
                         label='Min-Max Range')
 
         # Add error region using standard deviation
-        std_values = [data['std'] for data in fluorescence_data.sampling_points]
+        band_x, lower, upper = series['std']
         ax1.fill_between(
-            positions,
-            fluorescence_data.intensity_values - std_values,
-            fluorescence_data.intensity_values + std_values,
+            band_x,
+            lower,
+            upper,
             alpha=0.3, color='gray',
             label='±1 SD'
         )
@@ -260,8 +433,9 @@ class VisualizationPanel(QWidget):
         ax1.legend()
 
         # Plot curvature data if available
-        if curvature_data is not None:
-            ax2.plot(positions, curvature_data.curvatures,
+        if series['curvature'] is not None:
+            positions, curvatures = series['curvature']
+            ax2.plot(positions, curvatures,
                     'r-', linewidth=2)
 
             # Add reference lines for typical biological curvatures
@@ -278,4 +452,3 @@ class VisualizationPanel(QWidget):
 
         # Adjust layout to prevent overlap
         self.profile_fig.tight_layout()
-        self.profile_canvas.draw()
@@ -1,9 +1,19 @@
 #!/usr/bin/env python3
 # src/utils/data_structures.py
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
 import numpy as np
+from scipy.ndimage import correlate1d
+
+@lru_cache(maxsize=32)
+def _gaussian_kernel(sigma: float, truncate: float = 4.0) -> np.ndarray:
+    """Normalized 1D Gaussian kernel, as built by gaussian_filter1d."""
+    radius = int(truncate * sigma + 0.5)
+    x = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 / (sigma * sigma) * x ** 2)
+    return kernel / kernel.sum()
 
 @dataclass
 class ImageData:
@@ -21,15 +31,16 @@ class ImageData:
 class EdgeData:
     """Container for cell edge detection results."""
     contour: np.ndarray
-    edge_image: np.ndarray
+    edge_image: Optional[np.ndarray] = None  # Not rasterized by EdgeDetector
     smoothed_contour: Optional[np.ndarray] = None
 
     def smooth_contour(self, sigma: float) -> np.ndarray:
         """Apply Gaussian smoothing to contour."""
-        from scipy.ndimage import gaussian_filter1d
         if sigma > 0:
-            self.smoothed_contour = gaussian_filter1d(
-                self.contour.astype(float), sigma, axis=0)
+            # Equivalent to gaussian_filter1d with the kernel cached per sigma
+            self.smoothed_contour = correlate1d(
+                self.contour.astype(float), _gaussian_kernel(sigma),
+                axis=0, mode='reflect')
         else:
             self.smoothed_contour = self.contour.copy()
         return self.smoothed_contour
@@ -42,6 +53,7 @@ class CurvatureData:
     segment_indices: List[List[int]]
     ref_curvatures: Dict[str, float]
     radius_scale: float = 100  # nm scale factor
+    segments: Optional[List[np.ndarray]] = None  # Edge coordinates of each segment
 
 @dataclass
 class FluorescenceData:
@@ -51,13 +63,22 @@ class FluorescenceData:
     sampling_regions: List[np.ndarray]
     interior_overlaps: List[float]
 
-    @property
-    def mean_intensities(self):
-        return np.array([d['mean'] for d in self.sampling_points])
+    # Per-point arrays gathered once from sampling_points
+    mean_intensities: np.ndarray = field(init=False, repr=False)
+    min_intensities: np.ndarray = field(init=False, repr=False)
+    max_intensities: np.ndarray = field(init=False, repr=False)
+    std_intensities: np.ndarray = field(init=False, repr=False)
+    sampling_coordinates: np.ndarray = field(init=False, repr=False)
+    normal_vectors: np.ndarray = field(init=False, repr=False)
 
-    @property
-    def sampling_coordinates(self):
-        return np.array([d['center'] for d in self.sampling_points])
+    def __post_init__(self):
+        points = self.sampling_points
+        self.mean_intensities = np.array([d['mean'] for d in points])
+        self.min_intensities = np.array([d['min'] for d in points])
+        self.max_intensities = np.array([d['max'] for d in points])
+        self.std_intensities = np.array([d['std'] for d in points])
+        self.sampling_coordinates = np.array([d['center'] for d in points])
+        self.normal_vectors = np.array([d['normal'] for d in points])
 
 @dataclass
 class AnalysisParameters:
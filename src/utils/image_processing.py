@@ -3,13 +3,52 @@
 
 import numpy as np
 import cv2
+from functools import lru_cache
 from scipy import ndimage
 from skimage import filters, morphology, measure
 from typing import Optional, Tuple, List
 from ..utils.data_structures import ImageData
 
+@lru_cache(maxsize=16)
+def _ellipse_kernel(margin: int) -> np.ndarray:
+    """Elliptical structuring element spanning margin pixels each side."""
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (margin*2+1, margin*2+1))
+    kernel.flags.writeable = False
+    return kernel
+
+@lru_cache(maxsize=16)
+def _disk(radius: int) -> np.ndarray:
+    """Disk footprint of the given radius."""
+    footprint = morphology.disk(radius)
+    footprint.flags.writeable = False
+    return footprint
+
+@lru_cache(maxsize=16)
+def _rect_offsets(width: float, depth: float) -> np.ndarray:
+    """Corner offsets of a sampling rectangle along (perpendicular, normal)."""
+    half_width = width / 2
+    half_depth = depth / 2
+    offsets = np.array([
+        [-half_width, -half_depth],
+        [half_width, -half_depth],
+        [half_width, half_depth],
+        [-half_width, half_depth]
+    ])
+    offsets.flags.writeable = False
+    return offsets
+
 class ImageProcessor:
     """Class for handling common image processing operations."""
+
+    # Scratch buffer reused by polygon_mask, grown on demand
+    _mask_buffer = np.empty(0, dtype=np.uint8)
+
+    # Largest measure_background margin still handled by dilation
+    _DILATE_MAX_MARGIN = 10
+
+    # Image types accepted by cv2.minMaxLoc
+    _MINMAX_DTYPES = (np.uint8, np.int8, np.uint16, np.int16,
+                      np.int32, np.float32, np.float64)
     
     @staticmethod
     def normalize_image(image: np.ndarray) -> np.ndarray:
@@ -17,13 +56,21 @@ class ImageProcessor:
         if image.dtype == bool:
             return image.astype(np.float32)
             
-        img_min = np.min(image)
-        img_max = np.max(image)
+        # Single pass over the frame where OpenCV supports the type
+        if image.ndim == 2 and image.dtype in ImageProcessor._MINMAX_DTYPES:
+            img_min, img_max, _, _ = cv2.minMaxLoc(image)
+        else:
+            img_min = np.min(image)
+            img_max = np.max(image)
         
         if img_max == img_min:
             return np.zeros_like(image, dtype=np.float32)
-            
-        return ((image - img_min) / (img_max - img_min)).astype(np.float32)
+
+        # Offset and scale in float64 so wide integer types keep their
+        # precision, casting to float32 only at the end
+        normalized = np.subtract(image, img_min, dtype=np.float64)
+        normalized /= img_max - img_min
+        return normalized.astype(np.float32)
 
     @staticmethod
     def enhance_contrast(
@@ -32,12 +79,25 @@ class ImageProcessor:
         percentile_high: float = 99
     ) -> np.ndarray:
         """Enhance image contrast using percentile-based normalization."""
-        p_low = np.percentile(image, percentile_low)
-        p_high = np.percentile(image, percentile_high)
+        p_low, p_high = ImageProcessor.percentile_range(
+            image, percentile_low, percentile_high
+        )
         
         enhanced = np.clip(image, p_low, p_high)
         return ImageProcessor.normalize_image(enhanced)
 
+    @staticmethod
+    def percentile_range(
+        image: np.ndarray,
+        percentile_low: float = 1,
+        percentile_high: float = 99,
+        stride: int = 4
+    ) -> Tuple[float, float]:
+        """Estimate intensity percentiles from a strided subsample of the image."""
+        sample = image[::stride, ::stride] if image.ndim == 2 else image
+        p_low, p_high = np.percentile(sample, [percentile_low, percentile_high])
+        return float(p_low), float(p_high)
+
     @staticmethod
     def denoise_image(
         image: np.ndarray,
@@ -48,7 +108,7 @@ class ImageProcessor:
         if method == 'gaussian':
             return filters.gaussian(image, sigma=sigma)
         elif method == 'median':
-            return filters.median(image, morphology.disk(int(sigma)))
+            return filters.median(image, _disk(int(sigma)))
         elif method == 'bilateral':
             # Convert to uint8 for bilateral filter
             img_norm = (ImageProcessor.normalize_image(image) * 255).astype(np.uint8)
@@ -94,16 +154,58 @@ class ImageProcessor:
         if labels.max() == 0:
             return np.zeros_like(binary_image)
             
-        largest_component = None
-        max_area = 0
-        
-        for region in measure.regionprops(labels):
-            if region.area > max_area:
-                max_area = region.area
-                largest_component = region.label
+        # Component areas by label; argmax picks the first label on ties
+        areas = np.bincount(labels.ravel())
+        areas[0] = 0
+        largest_component = areas.argmax()
                 
         return labels == largest_component
 
+    @staticmethod
+    def polygon_mask(
+        polygon: np.ndarray,
+        shape: Tuple[int, int]
+    ) -> Tuple[np.ndarray, Tuple[slice, slice]]:
+        """Rasterize a polygon into a mask covering only its bounding box.
+
+        Returns the boolean mask and the (row, column) slices locating it
+        within an image of the given shape. The mask is a view into a shared
+        scratch buffer and is only valid until the next call.
+        """
+        x0, y0 = np.maximum(polygon.min(axis=0), 0)
+        x1 = min(polygon[:, 0].max() + 1, shape[1])
+        y1 = min(polygon[:, 1].max() + 1, shape[0])
+
+        height, width = y1 - y0, x1 - x0
+        if ImageProcessor._mask_buffer.size < height * width:
+            ImageProcessor._mask_buffer = np.empty(height * width, dtype=np.uint8)
+
+        mask = ImageProcessor._mask_buffer[:height * width].reshape(height, width)
+        mask.fill(0)
+        cv2.fillPoly(mask, [(polygon - (x0, y0)).astype(np.int32)], 1)
+        return mask.view(bool), (slice(y0, y1), slice(x0, x1))
+
+    @staticmethod
+    def inward_normal_sign(contour: np.ndarray) -> float:
+        """Sign that turns a contour's left-hand normals into inward normals."""
+        # The left-hand normal points into the cell when the signed
+        # (shoelace) area is positive
+        signed_area = cv2.contourArea(contour.astype(np.float32), oriented=True)
+        return -1.0 if signed_area < 0 else 1.0
+
+    @staticmethod
+    def sampling_rectangle(
+        point: np.ndarray,
+        normal: np.ndarray,
+        width: float,
+        depth: float
+    ) -> np.ndarray:
+        """Corners of a width x depth rectangle extending from point along normal."""
+        offsets = _rect_offsets(width, depth)
+        perpendicular = np.array([-normal[1], normal[0]])
+        center = point + (normal * depth / 2)
+        return center + offsets[:, :1] * perpendicular + offsets[:, 1:] * normal
+
     @staticmethod
     def measure_intensity_profile(
         image: np.ndarray,
@@ -119,17 +221,20 @@ class ImageProcessor:
         bin_edges = np.linspace(0, max_distance, distance_bins + 1)
         bin_centers = (bin_edges[1:] + bin_edges[:-1]) / 2
         
-        # Measure mean intensity in each distance bin
-        intensities = []
-        for i in range(len(bin_centers)):
-            bin_mask = (distance >= bin_edges[i]) & (distance < bin_edges[i+1])
-            if np.any(bin_mask):
-                mean_intensity = np.mean(image[bin_mask])
-                intensities.append(mean_intensity)
-            else:
-                intensities.append(0)
-                
-        return bin_centers, np.array(intensities)
+        # Assign pixels to half-open bins [edge_i, edge_i+1); the maximum
+        # distance falls past the last bin and is ignored
+        bin_index = np.searchsorted(bin_edges, distance.ravel(), side='right') - 1
+        in_range = bin_index < distance_bins
+        bin_index = bin_index[in_range]
+
+        # Measure mean intensity in each distance bin (0 for empty bins)
+        counts = np.bincount(bin_index, minlength=distance_bins)
+        sums = np.bincount(bin_index, weights=image.ravel()[in_range],
+                           minlength=distance_bins)
+        intensities = np.divide(sums, counts, out=np.zeros(distance_bins),
+                                where=counts > 0)
+
+        return bin_centers, intensities
 
     @staticmethod
     def analyze_cell_morphology(
@@ -146,10 +251,13 @@ class ImageProcessor:
         if not contours:
             return {}
             
-        contour = max(contours, key=cv2.contourArea)
+        # Largest contour, keeping its area rather than measuring it again
+        areas = [cv2.contourArea(c) for c in contours]
+        largest = int(np.argmax(areas))
+        contour = contours[largest]
         
         # Calculate metrics
-        area = cv2.contourArea(contour)
+        area = areas[largest]
         perimeter = cv2.arcLength(contour, True)
         circularity = 4 * np.pi * area / (perimeter * perimeter) if perimeter > 0 else 0
         
@@ -176,12 +284,19 @@ class ImageProcessor:
         margin: int = 10
     ) -> dict:
         """Measure background statistics."""
-        # Dilate mask to create background region
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (margin*2+1, margin*2+1))
-        dilated = cv2.dilate(mask.astype(np.uint8), kernel)
-        
-        # Background is region outside dilated mask
-        background_mask = ~dilated.astype(bool)
+        if margin <= ImageProcessor._DILATE_MAX_MARGIN:
+            # Dilate mask to create background region
+            dilated = cv2.dilate(mask.astype(np.uint8), _ellipse_kernel(margin))
+            
+            # Background is region outside dilated mask
+            background_mask = ~dilated.astype(bool)
+        else:
+            # Dilation cost grows with margin squared; the distance
+            # transform is independent of it
+            distance = cv2.distanceTransform(
+                (mask == 0).astype(np.uint8), cv2.DIST_L2, 5
+            )
+            background_mask = distance > margin
         background_values = image[background_mask]
         
         if len(background_values) == 0:
@@ -206,12 +321,14 @@ class ImageProcessor:
         # Estimate background using large-scale Gaussian blur
         background = filters.gaussian(image, sigma=sigma)
         
-        # Subtract background and rescale
-        corrected = image - background
-        corrected = corrected - np.min(corrected)
+        # Subtract background and rescale in place, reusing its buffer
+        corrected = np.subtract(image, background, out=background)
+        low = np.min(corrected)
+        span = np.max(corrected) - low
+        corrected -= low
         
-        if np.max(corrected) > 0:
-            corrected = corrected / np.max(corrected)
+        if span > 0:
+            corrected /= span
             
         return corrected
 
@@ -226,13 +343,6 @@ class ImageProcessor:
         image2: ImageData
     ) -> bool:
         """Validate that two images are compatible for analysis."""
-        if image1.data.shape != image2.data.shape:
-            return False
-            
-        if image1.is_stack != image2.is_stack:
-            return False
-            
-        if image1.is_stack and image1.data.shape[0] != image2.data.shape[0]:
-            return False
-            
-        return True
\ No newline at end of file
+        # Equal shapes already imply equal stack lengths
+        return (image1.is_stack == image2.is_stack and
+                image1.data.shape == image2.data.shape)
\ No newline at end of file